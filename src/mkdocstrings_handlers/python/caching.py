@@ -0,0 +1,346 @@
+"""This module implements persistent caches used by the handler."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from griffe import AliasResolutionError, CyclicAliasError
+from mkdocstrings.loggers import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from griffe import Alias, Object
+
+logger = get_logger(__name__)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Compute a stable fingerprint of the given parts.
+
+    Parameters:
+        *parts: JSON-serializable values (other values are converted to strings).
+
+    Returns:
+        A SHA256 hexadecimal digest.
+    """
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def directories_fingerprint(directories: list[str]) -> str:
+    """Compute a fingerprint of the files within the given directories.
+
+    Only file paths, modification times and sizes are used,
+    so that this stays cheap even for directories containing many files.
+
+    Parameters:
+        directories: The directories to fingerprint.
+
+    Returns:
+        A SHA256 hexadecimal digest.
+    """
+    parts = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for file in sorted(files):
+                with suppress(OSError):
+                    stat = os.stat(os.path.join(root, file))
+                    parts.append((root, file, stat.st_mtime_ns, stat.st_size))
+    return fingerprint(directories, parts)
+
+
+def _file_fingerprint(obj: Object, filepath: Path) -> str:
+    try:
+        lines = obj.lines_collection[filepath]
+    except (KeyError, ValueError):
+        # No source (compiled or inspected module): rely on the file metadata.
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return ""
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def object_fingerprint(obj: Object | Alias, file_hashes: dict[Path, str] | None = None) -> str:
+    """Compute a fingerprint of an object and its members.
+
+    Instead of serializing the whole tree of objects,
+    we rely on the contents of the files in which the object
+    and its members (including inherited ones and the targets of aliases) are defined:
+    any change to their docstrings, signatures or sources changes these contents.
+
+    Parameters:
+        obj: The object to fingerprint.
+        file_hashes: A dictionary used to memoize file fingerprints.
+
+    Returns:
+        A SHA256 hexadecimal digest.
+    """
+    if file_hashes is None:
+        file_hashes = {}
+    parts = []
+    seen = set()
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        try:
+            target = current.final_target if current.is_alias else current
+        except (AliasResolutionError, CyclicAliasError):
+            parts.append((current.path, current.target_path))  # type: ignore[union-attr]
+            continue
+        parts.append((current.path, target.path))
+        if id(target) in seen:
+            continue
+        seen.add(id(target))
+        filepaths = target.filepath if isinstance(target.filepath, list) else [target.filepath]
+        for filepath in filter(None, filepaths):
+            if filepath not in file_hashes:
+                file_hashes[filepath] = _file_fingerprint(target, filepath)  # type: ignore[arg-type]
+            parts.append((str(filepath), file_hashes[filepath]))
+        # Imported modules are never rendered with their members.
+        if not (current.is_alias and target.is_module):
+            stack.extend(target.all_members.values())
+    return fingerprint(parts)
+
+
+def _write_pickle(path: Path, value: Any) -> bool:
+    # Write atomically, so that concurrent builds never read partially written files.
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (AttributeError, TypeError, RecursionError, pickle.PicklingError) as error:
+        logger.debug(f"Could not serialize cache entry {path.name}: {error}")
+        return False
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+    except OSError as error:
+        logger.debug(f"Could not write cache entry {path.name}: {error}")
+        return False
+    return True
+
+
+def _read_pickle(path: Path) -> Any | None:
+    try:
+        with path.open("rb") as file:
+            return pickle.load(file)  # noqa: S301
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError) as error:
+        logger.debug(f"Could not read cache entry {path.name}: {error}")
+        return None
+
+
+class DiskCache:
+    """A persistent key-value store, writing one pickle file per entry.
+
+    Entries are written atomically, so concurrent builds sharing
+    the same directory never read partially written files.
+    Unreadable or corrupted entries are treated as missing.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory in which to store entries.
+        """
+        self.directory: Path = Path(directory)
+        """The directory in which entries are stored."""
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def get(self, key: str) -> Any | None:
+        """Get an entry from the cache.
+
+        Parameters:
+            key: The entry key, typically a [fingerprint][mkdocstrings_handlers.python.caching.fingerprint].
+
+        Returns:
+            The stored value, or none if there is no (valid) entry for this key.
+        """
+        return _read_pickle(self._path(key))
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store an entry in the cache.
+
+        Parameters:
+            key: The entry key, typically a [fingerprint][mkdocstrings_handlers.python.caching.fingerprint].
+            value: The (picklable) value to store.
+
+        Returns:
+            Whether the value could be stored.
+        """
+        return _write_pickle(self._path(key), value)
+
+    def delete(self, key: str) -> None:
+        """Delete an entry from the cache, if it exists.
+
+        Parameters:
+            key: The entry key.
+        """
+        self._path(key).unlink(missing_ok=True)
+
+
+class MemoryCache:
+    """An in-memory store of computed values, optionally persisted in a single file.
+
+    Unlike [`DiskCache`][mkdocstrings_handlers.python.caching.DiskCache],
+    which writes one file per entry, this store is meant for many small values:
+    entries are read from the file at once, and written back at once
+    when [saved][mkdocstrings_handlers.python.caching.MemoryCache.save].
+    Only the entries used since they were loaded are saved,
+    so that the file does not accumulate stale entries across builds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.entries: dict[Hashable, Any] = {}
+        """The stored values."""
+        self.path: Path | None = None
+        """The file in which entries are persisted, if any."""
+        self.hits: int = 0
+        """Number of values found in the cache."""
+        self.misses: int = 0
+        """Number of values that had to be computed."""
+        self._changed = False
+        self._used: set[Hashable] = set()
+
+    def load(self, path: str | os.PathLike) -> None:
+        """Persist entries in the given file, loading the entries it already contains.
+
+        Parameters:
+            path: The file path.
+        """
+        self.path = Path(path)
+        entries = _read_pickle(self.path)
+        if isinstance(entries, dict):
+            for key, value in entries.items():
+                self.entries.setdefault(key, value)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get a value from the cache.
+
+        Parameters:
+            key: The value key.
+
+        Returns:
+            The stored value, or none.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._used.add(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value in the cache.
+
+        Parameters:
+            key: The value key.
+            value: The (picklable) value.
+        """
+        self.entries[key] = value
+        self._used.add(key)
+        self._changed = True
+
+    def used(self) -> dict[Hashable, Any]:
+        """Get the entries used since they were loaded.
+
+        Returns:
+            The used entries.
+        """
+        return {key: self.entries[key] for key in self._used}
+
+    def update(self, entries: dict[Hashable, Any]) -> None:
+        """Store values in the cache, for example entries used by another process.
+
+        Parameters:
+            entries: The values, by key.
+        """
+        for key, value in entries.items():
+            self.set(key, value)
+
+    def save(self) -> None:
+        """Write the entries used since they were loaded to the file, if any, and if they changed.
+
+        Unused entries are dropped.
+        """
+        if self.path is None or not (self._changed or len(self._used) < len(self.entries)):
+            return
+        self.entries = {key: value for key, value in self.entries.items() if key in self._used}
+        if _write_pickle(self.path, self.entries):
+            self._changed = False
+
+
+class LRUCache:
+    """An in-memory store of computed values, bounded in size.
+
+    When the cache is full, storing a value evicts the least recently used one.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            maxsize: The maximum number of stored values. With zero or less, no value is stored.
+        """
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+        """The stored values, from the least to the most recently used."""
+        self.maxsize: int = maxsize
+        """The maximum number of stored values."""
+        self.hits: int = 0
+        """Number of values found in the cache."""
+        self.misses: int = 0
+        """Number of values that had to be computed."""
+
+    @property
+    def hit_rate(self) -> float:
+        """The proportion of values found in the cache, between 0 and 1."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get a value from the cache, marking it as the most recently used.
+
+        Parameters:
+            key: The value key.
+
+        Returns:
+            The stored value, or none.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value in the cache, evicting the least recently used values if needed.
+
+        Parameters:
+            key: The value key.
+            value: The value.
+        """
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
@@ -0,0 +1,721 @@
+"""This module implements native renderers for docstring sections.
+
+They produce the same HTML as the section templates of the Material theme
+(`docstring/parameters.html.jinja`, `docstring/returns.html.jinja`, etc.),
+in the three section styles, without the overhead of rendering templates:
+scoped blocks, imports of the language module, and attribute lookups for each cell.
+
+Native renderers are only used in place of templates that are not overridden:
+as soon as users override a section template (or the templates it relies on),
+this section is rendered with Jinja again.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+from weakref import WeakKeyDictionary
+
+from jinja2 import pass_context
+from markupsafe import Markup, escape
+
+from mkdocstrings_handlers.python.rendering import _is_our_template, _render_expression, do_get_template
+
+if TYPE_CHECKING:
+    from griffe import DocstringSection, Expr
+    from jinja2 import Environment
+    from jinja2.runtime import Context
+    from mkdocs_autorefs import AutorefsHookInterface
+
+
+_TEMPLATES_DIR = Path(__file__).parent / "templates" / "material"
+_TOC_SYMBOL = Markup('<code class="doc-symbol doc-symbol-toc doc-symbol-parameter"></code>&nbsp;')
+
+
+class _SectionRenderer:
+    # Shared state and helpers of the native renderers, mirroring the context of section templates.
+
+    def __init__(self, context: Context, autoref_hook: AutorefsHookInterface | None) -> None:
+        env = context.environment
+        self.config: dict[str, Any] = context["config"]
+        self.obj = context["obj"]
+        self.heading_level: int = context["heading_level"]
+        self.html_id: str = context["html_id"]
+        self.autoref_hook = autoref_hook
+        self.style: str = self.config["docstring_section_style"]
+        self._convert_markdown = env.filters["convert_markdown"]
+        self._heading = env.filters["heading"]
+        self._translations = _translations(context)
+
+    def t(self, key: str | None) -> Markup:
+        # Same as `lang.t(key)` in templates.
+        if (translation := self._translations[1].get(key)) is None:  # type: ignore[arg-type]
+            translation = self._translations[1][key] = self._translations[0].t(key)  # type: ignore[index]
+        return translation
+
+    def title(self, title: str | None, key: str) -> str:
+        # Same as `section.title or lang.t(key)`.
+        return escape(title) if title else self.t(key)
+
+    def spacy_title(self, title: str | None, key: str) -> str:
+        # Same as `(section.title or lang.t(key)).rstrip(":").upper()`.
+        return escape((title or self.t(key)).rstrip(":").upper())
+
+    def code(self, expression: str | Expr) -> str:
+        return f"<code>{_render_expression(expression, self.config, signature=False)}</code>"
+
+    def description(self, text: str) -> str:
+        return self._convert_markdown(text, self.heading_level, self.html_id, autoref_hook=self.autoref_hook)
+
+    def autoref(self, name: str) -> str:
+        # Cross-reference to a member of the current object.
+        name = escape(name)
+        return f'<autoref identifier="{escape(self.obj.path)}.{name}" optional hover>{name}</autoref>'
+
+    def parameter_heading(self, name: str, content: str) -> str:
+        toc_label = _TOC_SYMBOL + name if self.config["show_symbol_type_toc"] else name
+        return self._heading(
+            Markup(content),  # noqa: S704
+            self.heading_level + 1,
+            role="param",
+            id=f"{self.html_id}({name})",
+            toc_label=toc_label,
+            **{"class": "doc doc-heading doc-heading-parameter"},
+        )
+
+
+# Language modules, by environment: the environment's loader,
+# and for each locale, the module along with the translations it already gave.
+_languages: WeakKeyDictionary[Environment, tuple[Any, dict[str, tuple[Any, dict[str | None, Markup]]]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _translations(context: Context) -> tuple[Any, dict[str | None, Markup]]:
+    env = context.environment
+    loader, languages = _languages.get(env, (None, None))
+    if languages is None or loader is not env.loader:
+        languages = {}
+        _languages[env] = (env.loader, languages)
+    locale = context.get("locale")
+    if locale not in languages:
+        # Same as `{% import "language"|get_template as lang with context %}`.
+        template = env.get_template(do_get_template(env, "language"))
+        languages[locale] = (template.make_module(context.get_all()), {})
+    return languages[locale]
+
+
+def _render_parameters(r: _SectionRenderer, section: DocstringSection) -> list[str]:
+    html = []
+    if r.style == "table":
+        html.append(
+            f'<p><span class="doc-section-title">{r.title(section.title, "Parameters:")}</span></p>\n'
+            "    <table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f"          <th>{r.t('Name')}</th>\n"
+            f"          <th>{r.t('Type')}</th>\n"
+            f"          <th>{r.t('Description')}</th>\n"
+            f"          <th>{r.t('Default')}</th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for parameter in section.value:
+            name = escape(parameter.name)
+            html.append('          <tr class="doc-section-item">\n            <td>\n')
+            if r.config["parameter_headings"]:
+                html.append(r.parameter_heading(parameter.name, f"                  <code>{name}</code>\n"))
+            else:
+                html.append(f"                <code>{name}</code>\n")
+            html.append("            </td>\n            <td>\n")
+            if parameter.annotation:
+                html.append(f"                  {r.code(parameter.annotation)}\n")
+            html.append(
+                "            </td>\n"
+                "            <td>\n"
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(parameter.description)}\n"
+                "              </div>\n"
+                "            </td>\n"
+                "            <td>\n",
+            )
+            if parameter.default:
+                html.append(f"                  {r.code(parameter.default)}\n")
+            else:
+                html.append(f"                <em>{r.t('required')}</em>\n")
+            html.append("            </td>\n          </tr>\n")
+        html.append("      </tbody>\n    </table>\n")
+    elif r.style == "list":
+        html.append(
+            f'<p><span class="doc-section-title">{r.title(section.title, "Parameters:")}</span></p>\n    <ul>\n',
+        )
+        for parameter in section.value:
+            name = escape(parameter.name)
+            html.append('        <li class="doc-section-item field-body">\n')
+            if r.config["parameter_headings"]:
+                html.append(r.parameter_heading(parameter.name, f"              <b><code>{name}</code></b>\n"))
+            else:
+                html.append(f"            <b><code>{name}</code></b>\n")
+            if parameter.annotation:
+                html.append(f"              ({r.code(parameter.annotation)}")
+                if parameter.default:
+                    html.append(f", {r.t('default:')}\n                  {r.code(parameter.default)}\n")
+                html.append(")\n")
+            html.append(
+                "          \N{EN DASH}\n"
+                '          <div class="doc-md-description">\n'
+                f"            {r.description(parameter.description)}\n"
+                "          </div>\n"
+                "        </li>\n",
+            )
+        html.append("    </ul>\n")
+    elif r.style == "spacy":
+        html.append(
+            "<table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f'          <th><span class="doc-section-title">{r.spacy_title(section.title, "PARAMETER")}</span></th>\n'
+            f"          <th><span>{r.t('DESCRIPTION')}</span></th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for parameter in section.value:
+            name = escape(parameter.name)
+            html.append('          <tr class="doc-section-item">\n            <td>\n')
+            if r.config["parameter_headings"]:
+                html.append(r.parameter_heading(parameter.name, f"                  <code>{name}</code>\n"))
+            else:
+                html.append(f"                <code>{name}</code>\n")
+            html.append(
+                "            </td>\n"
+                '            <td class="doc-param-details">\n'
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(parameter.description)}\n"
+                "              </div>\n"
+                "              <p>\n",
+            )
+            if parameter.annotation:
+                html.append(
+                    '                  <span class="doc-param-annotation">\n'
+                    f"                    <b>{r.t('TYPE:')}</b>\n"
+                    f"                      {r.code(parameter.annotation)}\n"
+                    "                  </span>\n",
+                )
+            if parameter.default:
+                html.append(
+                    '                  <span class="doc-param-default">\n'
+                    f"                    <b>{r.t('DEFAULT:')}</b>\n"
+                    f"                      {r.code(parameter.default)}\n"
+                    "                  </span>\n",
+                )
+            html.append("              </p>\n            </td>\n          </tr>\n")
+        html.append("      </tbody>\n    </table>\n")
+    return html
+
+
+def _render_named_items(
+    r: _SectionRenderer,
+    section: DocstringSection,
+    *,
+    title: str,
+    spacy_title: str,
+    kind: str,
+    autoref: bool,
+    translate_type: bool,
+) -> list[str]:
+    # Sections of named items with an optional annotation: "Other Parameters" and "Attributes".
+    def item_name(name: str) -> str:
+        return r.autoref(name) if autoref else escape(name)
+
+    html = []
+    if r.style == "table":
+        html.append(
+            f'<p><span class="doc-section-title">{r.title(section.title, title)}</span></p>\n'
+            "    <table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f"          <th>{r.t('Name')}</th>\n"
+            f"          <th>{r.t('Type')}</th>\n"
+            f"          <th>{r.t('Description')}</th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in section.value:
+            html.append(
+                '          <tr class="doc-section-item">\n'
+                f"            <td><code>{item_name(item.name)}</code></td>\n"
+                "            <td>\n",
+            )
+            if item.annotation:
+                html.append(f"                  {r.code(item.annotation)}\n")
+            html.append(
+                "            </td>\n"
+                "            <td>\n"
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n"
+                "            </td>\n"
+                "          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    elif r.style == "list":
+        html.append(f'<p><span class="doc-section-title">{r.title(section.title, title)}</span></p>\n    <ul>\n')
+        for item in section.value:
+            html.append(
+                '        <li class="doc-section-item field-body">\n'
+                f"          <b><code>{item_name(item.name)}</code></b>\n",
+            )
+            if item.annotation:
+                html.append(f"              ({r.code(item.annotation)})\n")
+            html.append(
+                "          \N{EN DASH}\n"
+                '          <div class="doc-md-description">\n'
+                f"            {r.description(item.description)}\n"
+                "          </div>\n"
+                "        </li>\n",
+            )
+        html.append("    </ul>\n")
+    elif r.style == "spacy":
+        html.append(
+            "<table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f'          <th><span class="doc-section-title">{r.spacy_title(section.title, spacy_title)}</span></th>\n'
+            f"          <th><span>{r.t('DESCRIPTION')}</span></th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        type_label = r.t("TYPE:") if translate_type else "TYPE:"
+        for item in section.value:
+            html.append(
+                '          <tr class="doc-section-item">\n'
+                f"            <td><code>{item_name(item.name)}</code></td>\n"
+                f'            <td class="doc-{kind}-details">\n'
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n"
+                "              <p>\n",
+            )
+            if item.annotation:
+                html.append(
+                    f'                  <span class="doc-{kind}-annotation">\n'
+                    f"                    <b>{type_label}</b>\n"
+                    f"                      {r.code(item.annotation)}\n"
+                    "                  </span>\n",
+                )
+            html.append("              </p>\n            </td>\n          </tr>\n")
+        html.append("      </tbody>\n    </table>\n")
+    return html
+
+
+def _render_exceptions(
+    r: _SectionRenderer,
+    section: DocstringSection,
+    *,
+    title: str,
+    spacy_title: str,
+    kind: str,
+) -> list[str]:
+    # Sections of annotated items without names: "Raises" and "Warns".
+    html = []
+    if r.style == "table":
+        html.append(
+            f'<p><span class="doc-section-title">{r.title(section.title, title)}</span></p>\n'
+            "    <table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f"          <th>{r.t('Type')}</th>\n"
+            f"          <th>{r.t('Description')}</th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in section.value:
+            html.append('          <tr class="doc-section-item">\n            <td>\n')
+            if item.annotation:
+                html.append(f"                  {r.code(item.annotation)}\n")
+            html.append(
+                "            </td>\n"
+                "            <td>\n"
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n"
+                "            </td>\n"
+                "          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    elif r.style == "list":
+        # The "Raises" template translates the section title.
+        section_title = (r.t(section.title) or r.t(title)) if kind == "raises" else r.title(section.title, title)
+        html.append(f'<p><span class="doc-section-title">{section_title}</span></p>\n    <ul>\n')
+        for item in section.value:
+            html.append('        <li class="doc-section-item field-body">\n')
+            if item.annotation:
+                html.append(f"              {r.code(item.annotation)}\n            \N{EN DASH}\n")
+            html.append(
+                '          <div class="doc-md-description">\n'
+                f"            {r.description(item.description)}\n"
+                "          </div>\n"
+                "        </li>\n",
+            )
+        html.append("    </ul>\n")
+    elif r.style == "spacy":
+        html.append(
+            "<table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f'          <th><span class="doc-section-title">{r.spacy_title(section.title, spacy_title)}</span></th>\n'
+            f"          <th><span>{r.t('DESCRIPTION')}</span></th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in section.value:
+            html.append(
+                '          <tr class="doc-section-item">\n'
+                "            <td>\n"
+                f'              <span class="doc-{kind}-annotation">\n'
+                f"                  {r.code(item.annotation)}\n"
+                "              </span>\n"
+                "            </td>\n"
+                f'            <td class="doc-{kind}-details">\n'
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n"
+                "            </td>\n"
+                "          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    return html
+
+
+def _render_values(
+    r: _SectionRenderer,
+    section: DocstringSection,
+    *,
+    title: str,
+    spacy_title: str,
+    kind: str,
+) -> list[str]:
+    # Sections of values with optional names: "Returns", "Yields" and "Receives".
+    html = []
+    if r.style == "table":
+        name_column = any(item.name for item in section.value)
+        name_header = f"<th>{r.t('Name')}</th>" if name_column else ""
+        html.append(
+            f'    <p><span class="doc-section-title">{r.title(section.title, title)}</span></p>\n'
+            "    <table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f"{name_header}"
+            f"          <th>{r.t('Type')}</th>\n"
+            f"          <th>{r.t('Description')}</th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in section.value:
+            html.append('          <tr class="doc-section-item">\n')
+            if name_column:
+                html.append(f"<td>{f'<code>{escape(item.name)}</code>' if item.name else ''}</td>")
+            html.append("            <td>\n")
+            if item.annotation:
+                html.append(f"                  {r.code(item.annotation)}\n")
+            html.append(
+                "            </td>\n"
+                "            <td>\n"
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n"
+                "            </td>\n"
+                "          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    elif r.style == "list":
+        html.append(f'<p><span class="doc-section-title">{r.title(section.title, title)}</span></p>\n    <ul>\n')
+        for item in section.value:
+            html.append('        <li class="doc-section-item field-body">\n')
+            if item.name:
+                html.append(f"<b><code>{escape(item.name)}</code></b>")
+            if item.annotation:
+                html.append(
+                    f"{' (' if item.name else ''}              {r.code(item.annotation)}\n{')' if item.name else ''}",
+                )
+            html.append(
+                "          \N{EN DASH}\n"
+                '          <div class="doc-md-description">\n'
+                f"            {r.description(item.description)}\n"
+                "          </div>\n"
+                "        </li>\n",
+            )
+        html.append("    </ul>\n")
+    elif r.style == "spacy":
+        # The "Returns" template upper-cases the description header,
+        # and the "Yields" template adds a colon after the type label.
+        description = r.t("DESCRIPTION")
+        if kind == "returns":
+            description = description.upper()
+        type_label = f"{r.t('TYPE:')}:" if kind == "yields" else r.t("TYPE:")
+        html.append(
+            "<table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f'          <th><span class="doc-section-title">{r.spacy_title(section.title, spacy_title)}</span></th>\n'
+            f"          <th><span>{description}</span></th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in section.value:
+            html.append('          <tr class="doc-section-item">\n            <td>\n')
+            if item.name:
+                html.append(f"                <code>{escape(item.name)}</code>\n")
+            elif item.annotation:
+                html.append(
+                    f'                <span class="doc-{kind}-annotation">\n'
+                    f"                    {r.code(item.annotation)}\n"
+                    "                </span>\n",
+                )
+            html.append(
+                "            </td>\n"
+                f'            <td class="doc-{kind}-details">\n'
+                '              <div class="doc-md-description">\n'
+                f"                {r.description(item.description)}\n"
+                "              </div>\n",
+            )
+            if item.name and item.annotation:
+                html.append(
+                    "                <p>\n"
+                    f'                  <span class="doc-{kind}-annotation">\n'
+                    f"                    <b>{type_label}</b>\n"
+                    f"                      {r.code(item.annotation)}\n"
+                    "                  </span>\n"
+                    "                </p>\n",
+                )
+            html.append("            </td>\n          </tr>\n")
+        html.append("      </tbody>\n    </table>\n")
+    return html
+
+
+def _render_members(
+    r: _SectionRenderer,
+    section: DocstringSection,
+    *,
+    title: str,
+    spacy_title: str,
+    kind: str,
+) -> list[str]:
+    # Sections of members: "Functions", "Classes" and "Modules".
+    items = section.value
+    if kind == "function":
+        # Functions sections are titled "Methods" in classes, and `__init__` is skipped when merged into the class.
+        if r.obj.is_class:
+            section_title = r.title(section.title, "Methods:")
+            spacy_section_title = r.spacy_title(section.title, "METHOD")
+        else:
+            section_title = r.t(title)
+            spacy_section_title = r.spacy_title(None, spacy_title)
+        if r.config["merge_init_into_class"]:
+            items = [item for item in items if item.name != "__init__"]
+        indent = "  "
+    else:
+        section_title = r.title(section.title, title)
+        spacy_section_title = r.spacy_title(section.title, spacy_title)
+        indent = ""
+
+    html = []
+    if r.style == "table":
+        html.append(
+            f'<p><span class="doc-section-title">{section_title}</span></p>\n'
+            "    <table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f"          <th>{r.t('Name')}</th>\n"
+            f"          <th>{r.t('Description')}</th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in items:
+            html.append(
+                f'{indent}          <tr class="doc-section-item">\n'
+                f"{indent}            <td><code>{r.autoref(item.name)}</code></td>\n"
+                f"{indent}            <td>\n"
+                f'{indent}              <div class="doc-md-description">\n'
+                f"{indent}                {r.description(item.description)}\n"
+                f"{indent}              </div>\n"
+                f"{indent}            </td>\n"
+                f"{indent}          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    elif r.style == "list":
+        html.append(f'<p><span class="doc-section-title">{section_title}</span></p>\n    <ul>\n')
+        for item in items:
+            html.append(
+                f'{indent}        <li class="doc-section-item field-body">\n'
+                f"{indent}          <b><code>{r.autoref(item.name)}</code></b>\n"
+                f"{indent}          \N{EN DASH}\n"
+                f'{indent}          <div class="doc-md-description">\n'
+                f"{indent}            {r.description(item.description)}\n"
+                f"{indent}          </div>\n"
+                f"{indent}        </li>\n",
+            )
+        html.append("    </ul>\n")
+    elif r.style == "spacy":
+        html.append(
+            "<table>\n"
+            "      <thead>\n"
+            "        <tr>\n"
+            f'          <th><span class="doc-section-title">{spacy_section_title}</span></th>\n'
+            f"          <th><span>{r.t('DESCRIPTION')}</span></th>\n"
+            "        </tr>\n"
+            "      </thead>\n"
+            "      <tbody>\n",
+        )
+        for item in items:
+            html.append(
+                f'{indent}          <tr class="doc-section-item">\n'
+                f"{indent}            <td><code>{r.autoref(item.name)}</code></td>\n"
+                f'{indent}            <td class="doc-{kind}-details">\n'
+                f'{indent}              <div class="doc-md-description">\n'
+                f"{indent}                {r.description(item.description)}\n"
+                f"{indent}              </div>\n"
+                f"{indent}            </td>\n"
+                f"{indent}          </tr>\n",
+            )
+        html.append("      </tbody>\n    </table>\n")
+    return html
+
+
+# Native renderers, by section kind, along with the name of the template they replace.
+_renderers: dict[str, tuple[str, Callable[[_SectionRenderer, DocstringSection], list[str]]]] = {
+    "parameters": ("parameters", _render_parameters),
+    "other parameters": (
+        "other_parameters",
+        lambda r, section: _render_named_items(
+            r,
+            section,
+            title="Other Parameters:",
+            spacy_title="PARAMETER",
+            kind="param",
+            autoref=False,
+            translate_type=True,
+        ),
+    ),
+    "attributes": (
+        "attributes",
+        lambda r, section: _render_named_items(
+            r,
+            section,
+            title="Attributes:",
+            spacy_title="ATTRIBUTE",
+            kind="attribute",
+            autoref=True,
+            translate_type=False,
+        ),
+    ),
+    "raises": (
+        "raises",
+        lambda r, section: _render_exceptions(r, section, title="Raises:", spacy_title="RAISES", kind="raises"),
+    ),
+    "warns": (
+        "warns",
+        lambda r, section: _render_exceptions(r, section, title="Warns:", spacy_title="WARNS", kind="warns"),
+    ),
+    "returns": (
+        "returns",
+        lambda r, section: _render_values(r, section, title="Returns:", spacy_title="RETURNS", kind="returns"),
+    ),
+    "yields": (
+        "yields",
+        lambda r, section: _render_values(r, section, title="Yields:", spacy_title="YIELDS", kind="yields"),
+    ),
+    "receives": (
+        "receives",
+        lambda r, section: _render_values(r, section, title="Receives:", spacy_title="RECEIVES", kind="receives"),
+    ),
+    "functions": (
+        "functions",
+        lambda r, section: _render_members(r, section, title="Functions:", spacy_title="FUNCTION", kind="function"),
+    ),
+    "classes": (
+        "classes",
+        lambda r, section: _render_members(r, section, title="Classes:", spacy_title="CLASS", kind="class"),
+    ),
+    "modules": (
+        "modules",
+        lambda r, section: _render_members(r, section, title="Modules:", spacy_title="MODULE", kind="module"),
+    ),
+}
+
+# Whether section templates are the built-in ones, by environment:
+# the environment's loader, and for each template name, whether it is built-in.
+_builtin_templates: WeakKeyDictionary[Environment, tuple[Any, dict[str, bool]]] = WeakKeyDictionary()
+
+
+def _is_builtin_section_template(env: Environment, name: str) -> bool:
+    loader, templates = _builtin_templates.get(env, (None, None))
+    if templates is None or loader is not env.loader:
+        templates = {}
+        _builtin_templates[env] = (env.loader, templates)
+    if (builtin := templates.get(name)) is None:
+        # Native renderers mirror the templates of the Material theme, and their base templates.
+        # TODO: Stop using `do_get_template` when `*.html` templates are removed.
+        template = env.get_template(do_get_template(env, f"docstring/{name}"))
+        base_template = env.get_template(f"_base/docstring/{name}.html.jinja")
+        builtin = templates[name] = (
+            Path(template.filename) == _TEMPLATES_DIR / "docstring" / f"{name}.html.jinja"  # type: ignore[arg-type]
+            and Path(base_template.filename) == _TEMPLATES_DIR / "_base" / "docstring" / f"{name}.html.jinja"  # type: ignore[arg-type]
+        )
+    return builtin
+
+
+@pass_context
+def do_native_section(context: Context, section: DocstringSection) -> bool:
+    """Tell whether a docstring section can be rendered natively.
+
+    Sections can be rendered natively when native rendering and the sections are enabled in the configuration,
+    and when their template (and the expression template) are not overridden.
+
+    Parameters:
+        context: Jinja context, passed automatically.
+        section: The docstring section.
+
+    Returns:
+        Whether the section can be rendered natively.
+    """
+    config = context["config"]
+    if config.get("docstring_section_renderer", "jinja") != "native":
+        return False
+    kind = section.kind.value
+    if kind not in _renderers or not config.get(f"show_docstring_{kind.replace(' ', '_')}"):
+        return False
+    env = context.environment
+    return _is_builtin_section_template(env, _renderers[kind][0]) and _is_our_template(env, "expression")
+
+
+@pass_context
+def do_render_native_section(
+    context: Context,
+    section: DocstringSection,
+    autoref_hook: AutorefsHookInterface | None = None,
+) -> Markup:
+    """Render a docstring section natively.
+
+    The HTML is the same as the one rendered by the section template.
+
+    Parameters:
+        context: Jinja context, passed automatically.
+        section: The docstring section.
+        autoref_hook: The hook used to expand identifiers in cross-references.
+
+    Returns:
+        The rendered section.
+    """
+    render = _renderers[section.kind.value][1]
+    html = render(_SectionRenderer(context, autoref_hook), section)
+    return Markup("\n\n" + "".join(html))  # noqa: S704
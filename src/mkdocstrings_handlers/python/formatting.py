@@ -0,0 +1,526 @@
+"""This module implements formatters for signatures and attributes.
+
+The native formatter wraps long lines at brackets, the way Black does,
+without parsing code: it only needs to track brackets and strings.
+Other formatters are backends relying on external tools (Black, Ruff),
+registered in [`formatters`][mkdocstrings_handlers.python.formatting.formatters].
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from collections import defaultdict
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, ClassVar
+
+from mkdocstrings.loggers import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+logger = get_logger(__name__)
+
+_OPENING_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+_CLOSING_BRACKETS = set(_OPENING_BRACKETS.values())
+_INDENT = "    "
+
+
+def _string_end(code: str, start: int) -> int:
+    # Return the index right after the string starting at the given index.
+    quote = code[start]
+    if code.startswith(quote * 3, start):
+        quote *= 3
+    index = start + len(quote)
+    while index < len(code):
+        if code[index] == "\\":
+            index += 2
+            continue
+        if code.startswith(quote, index):
+            return index + len(quote)
+        index += 1
+    return len(code)
+
+
+def _mask_strings(code: str) -> str:
+    # Blank out the contents of strings, keeping their prefixes and quotes, and positions.
+    parts = []
+    start = index = 0
+    while index < len(code):
+        if code[index] not in {"'", '"'}:
+            index += 1
+            continue
+        end = _string_end(code, index)
+        quote = code[index] * (3 if code.startswith(code[index] * 3, index) else 1)
+        content_start, content_end = index + len(quote), max(index + len(quote), end - len(quote))
+        parts.append(code[start:content_start] + " " * (content_end - content_start) + code[content_end:end])
+        start = index = end
+    parts.append(code[start:])
+    return "".join(parts)
+
+
+def _mask_nested(code: str) -> str:
+    # Blank out the contents of strings and top-level brackets, keeping positions.
+    masked = list(_mask_strings(code))
+    depth = 0
+    for index, char in enumerate(masked):
+        if char in _CLOSING_BRACKETS:
+            depth -= 1
+        if depth > 0:
+            masked[index] = " "
+        if char in _OPENING_BRACKETS:
+            depth += 1
+    return "".join(masked)
+
+
+def _normalize_quotes(code: str) -> str:
+    # Prefer double quotes, like Black, unless the string contains some.
+    parts = []
+    start = index = 0
+    while index < len(code):
+        char = code[index]
+        if char not in {"'", '"'}:
+            index += 1
+            continue
+        end = _string_end(code, index)
+        body = code[index + 1 : end - 1]
+        if char == "'" and end > index + 1 and not code.startswith("'''", index) and '"' not in body:
+            if "\\\\" not in body:
+                body = body.replace("\\'", "'")
+            parts.append(f'{code[start:index]}"{body}"')
+            start = end
+        index = end
+    parts.append(code[start:])
+    return "".join(parts)
+
+
+def _top_level_brackets(code: str) -> list[tuple[int, int]]:
+    # Return the positions of the top-level pairs of brackets.
+    pairs = []
+    stack: list[int] = []
+    index = 0
+    while index < len(code):
+        char = code[index]
+        if char in {"'", '"'}:
+            index = _string_end(code, index)
+            continue
+        if char in _OPENING_BRACKETS:
+            stack.append(index)
+        elif char in _CLOSING_BRACKETS and stack:
+            start = stack.pop()
+            if not stack:
+                pairs.append((start, index))
+        index += 1
+    return pairs
+
+
+def _split_items(code: str) -> list[str]:
+    # Split code on top-level commas.
+    items = []
+    depth = 0
+    start = index = 0
+    while index < len(code):
+        char = code[index]
+        if char in {"'", '"'}:
+            index = _string_end(code, index)
+            continue
+        if char in _OPENING_BRACKETS:
+            depth += 1
+        elif char in _CLOSING_BRACKETS:
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(code[start:index].strip())
+            start = index + 1
+        index += 1
+    items.append(code[start:].strip())
+    return [item for item in items if item]
+
+
+def _is_literal(head: str) -> bool:
+    # Whether the opening bracket ending the given code starts a collection literal,
+    # and not a call or a subscript.
+    before = head[:-1].rstrip()
+    return not before or not (before[-1].isidentifier() or before[-1].isdigit() or before[-1] in ")]}'\"")
+
+
+def _uses_recent_syntax(code: str) -> bool:
+    # Whether Black would detect syntax requiring Python 3.6 or later in the code:
+    # f-strings, underscores in numbers, positional-only parameters, assignment expressions or variadic generics.
+    return bool(_RECENT_SYNTAX_RE.search(_mask_strings(code)))
+
+
+_RECENT_SYNTAX_RE = re.compile(r"\b[a-zA-Z]*[fF][a-zA-Z]*[\"']|\b\d\w*_|:=|[(,]\s*/\s*[,)]|:\s*\*|\w\[\s*\*")
+
+
+def _comprehension_clauses(code: str) -> list[str]:
+    # Split a comprehension before its top-level `for` and `if` clauses.
+    masked = _mask_nested(code)
+    first_for = masked.find(" for ")
+    if first_for == -1:
+        return []
+    starts = [0, first_for + 1]
+    starts.extend(match.start() + 1 for match in _CLAUSE_RE.finditer(masked, first_for + 1))
+    return [code[start:end].strip() for start, end in zip(starts, [*starts[1:], len(code)])]
+
+
+_CLAUSE_RE = re.compile(r" (?:async for|for|if) ")
+
+
+def _has_commas(parameter: str) -> bool:
+    # Whether Black sees commas in a parameter, ignoring the ones in its annotation
+    # (except for annotations of variadic positional parameters).
+    masked = _mask_strings(parameter)
+    nested = _mask_nested(parameter)
+    if "," in nested or (parameter.startswith("*") and not parameter.startswith("**")):
+        return "," in masked
+    colon, equal = nested.find(":"), nested.find("=")
+    if colon == -1 or -1 < equal < colon:
+        return "," in masked
+    return "," in masked[:colon] or (equal != -1 and "," in masked[equal:])
+
+
+def _union_members(code: str) -> list[str]:
+    # Split code on top-level `|` operators.
+    masked = _mask_nested(code)
+    starts = [0, *(match.end() for match in _UNION_RE.finditer(masked))]
+    ends = [*(match.start() for match in _UNION_RE.finditer(masked)), len(code)]
+    return [code[start:end] for start, end in zip(starts, ends)]
+
+
+_UNION_RE = re.compile(r" \| ")
+
+
+def _wrap_return_annotation(annotation: str, indent: str, line_length: int, *, star_commas: bool) -> list[str] | None:
+    # Like Black, we wrap return annotations that are unions, or that have no brackets to split
+    # (unless they are a single name or string that would not fit anyway), in parentheses,
+    # and split unions before their `|` operators.
+    members = _union_members(annotation)
+    has_brackets = any(annotation[start + 1 : end].strip() for start, end in _top_level_brackets(annotation))
+    if len(members) == 1 and (has_brackets or (_is_atom(annotation) and len(_INDENT) + len(annotation) > line_length)):
+        return None
+    inner_indent = indent + _INDENT
+    if len(members) == 1 or len(inner_indent) + len(annotation) <= line_length:
+        lines = [inner_indent + annotation]
+    else:
+        lines = [
+            line
+            for index, member in enumerate(members)
+            for line in _wrap(f"| {member}" if index else member, inner_indent, line_length, star_commas=star_commas)
+        ]
+    return [f"{indent}) -> (", *lines, f"{indent})"]
+
+
+def _wrap(
+    code: str,
+    indent: str,
+    line_length: int,
+    *,
+    first_bracket: bool = False,
+    reserved: int = 0,
+    star_commas: bool = False,
+) -> list[str]:
+    # Wrapping the first bracket means wrapping the parameters of a signature.
+    # Reserved characters are the ones Black sees on the same line, but that we do not render:
+    # `def ` and `:` around signatures.
+    if len(indent) + len(code) + reserved <= line_length:
+        return [indent + code]
+    pairs = [(start, end) for start, end in _top_level_brackets(code) if code[start + 1 : end].strip()]
+    if not pairs:
+        return [indent + code]
+    if first_bracket:
+        start, end = pairs[0]
+    else:
+        # Like Black, we split the last pair of brackets, unless the line before it would still be too long.
+        start, end = next(
+            ((start, end) for start, end in reversed(pairs) if len(indent) + start + 1 <= line_length),
+            pairs[-1],
+        )
+    head, body, tail = code[: start + 1], code[start + 1 : end].strip(), code[end:]
+    inner_indent = indent + _INDENT
+
+    # Like Black, we split comprehensions before their `for` and `if` clauses, not on commas.
+    clauses = _comprehension_clauses(body)
+    items = [body] if clauses else _split_items(body)
+    # Like Black, we always put items of collection literals on their own line.
+    explode = (len(items) > 1 or body.endswith(",")) and _is_literal(head)
+    # Like Black, we add a trailing comma after a single parameter, unless it contains commas itself
+    # (commas in its annotation do not count).
+    single_comma = not first_bracket or not _has_commas(body)
+    comma = "," if first_bracket and single_comma else ""
+    if len(inner_indent) + len(body) + len(comma) <= line_length and not body.endswith(",") and not explode:
+        lines = [inner_indent + body + comma]
+    elif clauses:
+        lines = [
+            line for clause in clauses for line in _wrap(clause, inner_indent, line_length, star_commas=star_commas)
+        ]
+    elif len(items) == 1 and not body.endswith(",") and not first_bracket:
+        lines = _wrap(items[0], inner_indent, line_length, star_commas=star_commas)
+    else:
+        # Like Black, we do not add a trailing comma after items of parameters or arguments
+        # when one of them is variadic or unpacked (including the `*` separator of keyword-only parameters),
+        # unless the code uses syntax requiring a Python version supporting these trailing commas.
+        trailing_comma = (
+            single_comma
+            if len(items) == 1
+            else star_commas
+            or not head.endswith("(")
+            or _is_literal(head)
+            or not any(item.startswith("*") for item in items)
+        )
+        lines = []
+        for index, item in enumerate(items, 1):
+            comma = index < len(items) or trailing_comma
+            item_lines = _wrap(item, inner_indent, line_length, reserved=1 if comma else 0, star_commas=star_commas)
+            if comma:
+                item_lines[-1] += ","
+            lines.extend(item_lines)
+    tail_lines = None
+    if first_bracket and tail.startswith(") -> ") and len(indent) + len(tail) + 1 > line_length:
+        tail_lines = _wrap_return_annotation(tail[5:], indent, line_length, star_commas=star_commas)
+    if tail_lines is None:
+        tail_lines = _wrap(tail, indent, line_length, reserved=1 if first_bracket else 0, star_commas=star_commas)
+    return [indent + head, *lines, *tail_lines]
+
+
+def _assignment(code: str) -> tuple[str, str] | None:
+    # Split an assignment on its top-level equal sign, if any.
+    index = _mask_nested(code).find(" = ")
+    if index == -1:
+        return None
+    return code[:index], code[index + 3 :]
+
+
+def _is_atom(code: str) -> bool:
+    # Whether the code is a single name, number or string, that Black cannot split.
+    prefix = len(code) - len(code.lstrip(_STRING_PREFIXES))
+    if code[prefix : prefix + 1] in {"'", '"'}:
+        return _string_end(code, prefix) == len(code)
+    return bool(_ATOM_RE.fullmatch(code))
+
+
+_ATOM_RE = re.compile(r"\w+|\d[\w.]*")
+_STRING_PREFIXES = "rRbBuUfF"
+
+
+def wrap_code(code: str, line_length: int, *, first_bracket: bool = False) -> str:
+    """Wrap a line of code at brackets, so that it fits within the given line length.
+
+    When the line is too long, the contents of the last pair of brackets
+    (or first one, for signatures) are moved to an indented line.
+    When these contents are still too long, they are split on commas,
+    one item per line with a trailing comma, and each item is wrapped again.
+    Like Black, the value of an assignment without brackets is wrapped in parentheses instead,
+    and string quotes are normalized to double quotes when possible.
+    Signatures are wrapped like Black wraps function definitions:
+    lines count the `def ` keyword and the final colon, which are not part of the code,
+    a single parameter gets a trailing comma unless it contains commas outside of its annotation,
+    and long return annotations that are unions or have no brackets to split are wrapped in parentheses.
+
+    Comprehensions are split before their `for` and `if` clauses.
+
+    Unlike Black, operators (for example in `a + b`) are never split, except `|` in return annotations,
+    annotations of attributes are never wrapped,
+    brackets are always split from the last pair (or first one, for signatures)
+    even when Black would prefer another one,
+    and code is not otherwise reformatted (spaces around operators, quotes in strings containing both kinds).
+
+    Parameters:
+        code: The code to wrap.
+        line_length: The maximum line length.
+        first_bracket: Whether to wrap the first pair of brackets instead of the last one.
+
+    Returns:
+        The wrapped code.
+    """
+    code = _normalize_quotes(code.strip())
+    star_commas = _uses_recent_syntax(code)
+    if first_bracket:
+        return "\n".join(_wrap(code, "", line_length, first_bracket=True, reserved=5, star_commas=star_commas))
+    if len(code) > line_length and (assignment := _assignment(code)) is not None:
+        target, value = assignment
+        if not any(value[start + 1 : end].strip() for start, end in _top_level_brackets(value)) and (
+            not _is_atom(value) or len(_INDENT) + len(value) <= line_length
+        ):
+            return f"{target} = (\n{_INDENT}{value}\n)"
+    return "\n".join(_wrap(code, "", line_length, star_commas=star_commas))
+
+
+class Formatter:
+    """A formatter backend, formatting snippets of code with an external tool.
+
+    Snippets are either function definitions (for signatures)
+    or assignments (for attributes). Subclasses implement
+    [`version`][mkdocstrings_handlers.python.formatting.Formatter.version]
+    and [`format_many`][mkdocstrings_handlers.python.formatting.Formatter.format_many].
+    """
+
+    name: ClassVar[str] = "identity"
+    """The name of the formatter, as used in the `signature_formatter` option."""
+    fallback: ClassVar[str | None] = None
+    """The name of the formatter to use when this one is not available."""
+    batched: ClassVar[bool] = False
+    """Whether formatting snippets in a single batch is faster than formatting them one by one."""
+
+    @cached_property
+    def version(self) -> str | None:
+        """The version of the formatter, or none if it is not available."""
+        return None
+
+    def format(self, code: str, line_length: int) -> str:
+        """Format a snippet of code.
+
+        Parameters:
+            code: The code to format.
+            line_length: The maximum line length.
+
+        Returns:
+            The formatted code.
+        """
+        return self.format_many([(code, line_length)])[0]
+
+    def format_many(self, codes: Sequence[tuple[str, int]], executor: Executor | None = None) -> list[str]:  # noqa: ARG002
+        """Format snippets of code.
+
+        Parameters:
+            codes: The snippets to format, with their maximum line length.
+            executor: An optional pool of processes in which to format code.
+
+        Returns:
+            The formatted snippets, in the same order.
+        """
+        return [code for code, _ in codes]
+
+
+def _black_format(code: str, line_length: int) -> str:
+    # Also called in worker processes, see `BlackFormatter.format_many`.
+    from black import InvalidInput, Mode, format_str
+
+    mode = Mode(line_length=line_length)
+    try:
+        return format_str(code, mode=mode)
+    except InvalidInput:
+        return code
+
+
+class BlackFormatter(Formatter):
+    """Format code with [Black](https://github.com/psf/black), in the current process or in a pool of processes."""
+
+    name = "black"
+
+    @cached_property
+    def version(self) -> str | None:  # noqa: D102
+        try:
+            from black import __version__  # noqa: PLC0415 (Black is an optional dependency)
+        except ModuleNotFoundError:
+            return None
+        return __version__
+
+    def format_many(self, codes: Sequence[tuple[str, int]], executor: Executor | None = None) -> list[str]:  # noqa: D102
+        if executor is None or len(codes) < 2:  # noqa: PLR2004
+            return [_black_format(code, line_length) for code, line_length in codes]
+        return list(executor.map(_black_format, *zip(*codes)))
+
+
+def _find_ruff() -> str | None:
+    # The `ruff` distribution knows where its binary is installed,
+    # even when the environment's scripts directory is not in the PATH.
+    try:
+        from ruff.__main__ import find_ruff_bin  # noqa: PLC0415 (Ruff is an optional dependency)
+    except ImportError:
+        return shutil.which("ruff")
+    try:
+        return os.fsdecode(find_ruff_bin())
+    except FileNotFoundError:
+        return shutil.which("ruff")
+
+
+class RuffFormatter(Formatter):
+    """Format code with [Ruff](https://github.com/astral-sh/ruff), running a single `ruff format` command per batch.
+
+    Each snippet is written to its own file in a temporary directory,
+    so that a snippet that cannot be parsed does not prevent formatting the others.
+    Ruff formats the files in parallel, ignoring any configuration file.
+    """
+
+    name = "ruff"
+    fallback = "black"
+    batched = True
+
+    @cached_property
+    def executable(self) -> str | None:
+        """The path to the Ruff executable, if found."""
+        return _find_ruff()
+
+    @cached_property
+    def version(self) -> str | None:  # noqa: D102
+        if self.executable is None:
+            return None
+        try:
+            process = subprocess.run([self.executable, "--version"], capture_output=True, text=True, check=True)  # noqa: S603
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return process.stdout.strip().removeprefix("ruff ")
+
+    def format_many(self, codes: Sequence[tuple[str, int]], executor: Executor | None = None) -> list[str]:  # noqa: ARG002,D102
+        results = [code for code, _ in codes]
+        by_line_length = defaultdict(list)
+        for index, (_, line_length) in enumerate(codes):
+            by_line_length[line_length].append(index)
+        for line_length, indices in by_line_length.items():
+            with tempfile.TemporaryDirectory(prefix="mkdocstrings-python-") as directory:
+                paths = {index: os.path.join(directory, f"{index}.py") for index in indices}
+                for index, path in paths.items():
+                    with open(path, "w", encoding="utf8") as file:
+                        file.write(results[index])
+                command = [self.executable, "format", "--isolated", "--no-cache", "--line-length", str(line_length)]
+                try:
+                    # Ruff exits with an error code when some files cannot be parsed:
+                    # we simply keep these snippets unformatted.
+                    subprocess.run([*command, directory], capture_output=True, check=False)  # noqa: S603
+                except OSError as error:
+                    logger.debug(f"Could not run Ruff: {error}")
+                    continue
+                for index, path in paths.items():
+                    with open(path, encoding="utf8") as file:
+                        results[index] = file.read()
+        return results
+
+
+formatters: dict[str, type[Formatter]] = {
+    BlackFormatter.name: BlackFormatter,
+    RuffFormatter.name: RuffFormatter,
+}
+"""The available formatter backends, by name. Other backends can be registered here."""
+
+
+@cache
+def get_formatter(name: str) -> Formatter:
+    """Get an available formatter backend.
+
+    When the requested formatter is not available,
+    its fallback is used instead, if any,
+    or else code is left unformatted.
+
+    Parameters:
+        name: The name of the formatter.
+
+    Returns:
+        A formatter instance.
+    """
+    requested = name
+    while (formatter_class := formatters.get(name)) is not None:
+        formatter = formatter_class()
+        if formatter.version is not None:
+            if name != requested:
+                logger.info(f"Formatter '{requested}' is not available, using '{name}' instead.")
+            return formatter
+        name = formatter.fallback  # type: ignore[assignment]
+    if requested == BlackFormatter.name:
+        logger.info("Formatting signatures requires Black to be installed.")
+    else:
+        logger.info(f"Formatter '{requested}' is not available, signatures will not be formatted.")
+    return Formatter()
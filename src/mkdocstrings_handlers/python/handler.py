@@ -3,35 +3,62 @@
 from __future__ import annotations
 
 import glob
+import hashlib
+import multiprocessing
 import os
 import posixpath
 import re
 import sys
+import tempfile
 from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
+from copy import deepcopy
+from functools import partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar
 
 from griffe import (
     AliasResolutionError,
-    GriffeLoader,
     LinesCollection,
-    ModulesCollection,
     Parser,
     load_extensions,
     patch_loggers,
 )
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+from mkdocs.utils import get_relative_url
 from mkdocstrings.extension import PluginError
 from mkdocstrings.handlers.base import BaseHandler, CollectionError, CollectorItem
 from mkdocstrings.inventory import Inventory
 from mkdocstrings.loggers import get_logger
 
-from mkdocstrings_handlers.python import rendering
+from mkdocstrings_handlers.python import docstrings, rendering
+from mkdocstrings_handlers.python.caching import (
+    DiskCache,
+    LRUCache,
+    MemoryCache,
+    directories_fingerprint,
+    fingerprint,
+    object_fingerprint,
+)
+from mkdocstrings_handlers.python.debug import get_version
+from mkdocstrings_handlers.python.formatting import formatters, get_formatter
+from mkdocstrings_handlers.python.loading import (
+    LazyModulesCollection,
+    ModulesCache,
+    ModulesTracker,
+    PythonLoader,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Mapping, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+    from xml.etree.ElementTree import Element
 
     from markdown import Markdown
+    from mkdocs.structure.files import File
+    from mkdocs_autorefs import AutorefsHookInterface, AutorefsPlugin
 
 
 if sys.version_info >= (3, 11):
@@ -54,6 +81,60 @@ logger = get_logger(__name__)
 
 patch_loggers(get_logger)
 
+# Distributions whose versions affect rendered HTML fragments.
+_RENDERING_DISTRIBUTIONS = (
+    "mkdocstrings-python",
+    "mkdocstrings",
+    "mkdocs-autorefs",
+    "griffe",
+    "jinja2",
+    "markdown",
+    "pygments",
+    "pymdown-extensions",
+)
+
+# Directory in which deferred sources are written, relative to the site directory, see `show_source`.
+_SOURCES_DIR = "assets/_mkdocstrings_python/sources"
+
+# Loads the deferred source of a details element (once) when it is opened.
+_LOAD_SOURCE_SCRIPT = (
+    "if(this.open&&!this.dataset.loaded){this.dataset.loaded=1;"
+    "fetch(this.dataset.src).then(r=>r.text()).then(h=>this.insertAdjacentHTML('beforeend',h))}"
+)
+
+# Number of highlighted sources kept in memory, see `PythonHandler._highlight_source`.
+_HIGHLIGHTED_SOURCES_CACHE_SIZE = 512
+
+# Attributes to which the parent HTML id is prepended when converting Markdown.
+_ID_ATTRIBUTES = re.compile(r' (?:id|name|for)="| href="#')
+
+# With `keep_loaded_modules`, loaded modules are shared by handlers using the same search paths:
+# `mkdocs serve` instantiates a new handler on each rebuild,
+# and we only want to reload the modules that changed in-between.
+# Only the modules of the few most recently used sets of search paths are kept.
+_LOADED_MODULES = LRUCache(4)
+
+# The handler and items of the batch being rendered, inherited by forked worker processes,
+# see `PythonHandler.render_batch`.
+_BATCH: dict[str, Any] = {}
+
+
+def _init_batch_worker() -> None:
+    handler = _BATCH["handler"]
+    # Workers cannot use the pool of processes of their parent, and already render in parallel.
+    handler._format_workers = 1
+    handler._format_pool = None
+
+
+def _render_batch_item(index: int) -> tuple[str, list[Element], dict]:
+    identifier, config = _BATCH["items"][index]
+    handler = _BATCH["handler"]
+    # The formatted code used by each object is sent back, to be kept in the parent's cache.
+    cache = handler._formatted_code_cache = MemoryCache()
+    cache.entries = _BATCH["formatted_code"]
+    html, headings = handler._render_item(identifier, config)
+    return html, headings, cache.used()
+
 
 class PythonHandler(BaseHandler):
     """The Python handler class."""
@@ -86,6 +167,8 @@ class PythonHandler(BaseHandler):
         "signature_crossrefs": False,
         "separate_signature": False,
         "line_length": 60,
+        "signature_formatter": "black",
+        "signature_highlighter": "pygments",
         "merge_init_into_class": False,
         "relative_crossrefs": False,
         "scoped_crossrefs": False,
@@ -110,6 +193,7 @@ class PythonHandler(BaseHandler):
         "heading_level": 2,
         "members_order": rendering.Order.alphabetical.value,
         "docstring_section_style": "table",
+        "docstring_section_renderer": "jinja",
         "members": None,
         "inherited_members": False,
         "filters": ["!^_[^_]"],
@@ -117,10 +201,12 @@ class PythonHandler(BaseHandler):
         "preload_modules": None,
         "allow_inspection": True,
         "summary": False,
+        "split_members_threshold": None,
         "show_labels": True,
         "unwrap_annotated": False,
         "parameter_headings": False,
         "modernize_annotations": False,
+        "targeted_loading": False,
     }
     """Default handler configuration.
 
@@ -129,7 +215,7 @@ class PythonHandler(BaseHandler):
         allow_inspection (bool): Whether to allow inspecting modules when visiting them is not possible. Default: `True`.
         show_bases (bool): Show the base classes of a class. Default: `True`.
         show_inheritance_diagram (bool): Show the inheritance diagram of a class using Mermaid. Default: `False`.
-        show_source (bool): Show the source code of this object. Default: `True`.
+        show_source (bool | str): Show the source code of this object. With `"lazy"`, load it only when its block is opened. Default: `True`.
         preload_modules (list[str] | None): Pre-load modules that are
             not specified directly in autodoc instructions (`::: identifier`).
             It is useful when you want to render documentation for a particular member of an object,
@@ -139,6 +225,8 @@ class PythonHandler(BaseHandler):
             of the importing module.
 
             The modules must be listed as an array of strings. Default: `None`.
+        targeted_loading (bool): Only load the modules leading to the requested objects, instead of whole packages.
+            Other modules are loaded on demand, for example when resolving aliases. Default: `False`.
 
     Attributes: Headings options:
         heading_level (int): The initial heading level to use. Default: `2`.
@@ -170,12 +258,16 @@ class PythonHandler(BaseHandler):
         group_by_category (bool): Group the object's children by categories: attributes, classes, functions, and modules. Default: `True`.
         show_submodules (bool): When rendering a module, show its submodules recursively. Default: `False`.
         summary (bool | dict[str, bool]): Whether to render summaries of modules, classes, functions (methods) and attributes.
+        split_members_threshold (int | None): Maximum number of members rendered in place for a module or class.
+            Objects with more members only render summaries of them, linking to their own documentation. Default: `None`.
         show_labels (bool): Whether to show labels of the members. Default: `True`.
 
     Attributes: Docstrings options:
         docstring_style (str): The docstring style to use: `google`, `numpy`, `sphinx`, or `None`. Default: `"google"`.
         docstring_options (dict): The options for the docstring parser. See [docstring parsers](https://mkdocstrings.github.io/griffe/reference/docstrings/) and their options in Griffe docs.
         docstring_section_style (str): The style used to render docstring sections. Options: `table`, `list`, `spacy`. Default: `"table"`.
+        docstring_section_renderer (str): How to render docstring sections: `jinja` (with templates),
+            or `native` (with built-in functions producing the same HTML, when templates are not overridden). Default: `"jinja"`.
         merge_init_into_class (bool): Whether to merge the `__init__` method into the class' signature and docstring. Default: `False`.
         relative_crossrefs (bool): Whether to enable the relative crossref syntax. Default: `False`.
         scoped_crossrefs (bool): Whether to enable the scoped crossref ability. Default: `False`.
@@ -197,6 +289,11 @@ class PythonHandler(BaseHandler):
     Attributes: Signatures/annotations options:
         annotations_path (str): The verbosity for annotations path: `brief` (recommended), or `source` (as written in the source). Default: `"brief"`.
         line_length (int): Maximum line length when formatting code/signatures. Default: `60`.
+        signature_formatter (str): The formatter used for signatures and attributes: `black`, `ruff`
+            (formatting all signatures of an object with a single `ruff format` command, falling back to Black),
+            or `native` (a faster formatter wrapping lines at brackets, which does not require Black). Default: `"black"`.
+        signature_highlighter (str): The highlighter used for signatures and attributes: `pygments`,
+            or `native` (a faster highlighter producing the same HTML as Pygments, for most signatures). Default: `"pygments"`.
         show_signature (bool): Show methods and functions signatures. Default: `True`.
         show_signature_annotations (bool): Show the type annotations in methods and functions signatures. Default: `False`.
         signature_crossrefs (bool): Whether to render cross-references for type annotations in signatures. Default: `False`.
@@ -213,6 +310,12 @@ class PythonHandler(BaseHandler):
         paths: list[str] | None = None,
         locale: str = "en",
         load_external_modules: bool | None = None,
+        cache_dir: str | None = None,
+        load_workers: int | None = None,
+        format_workers: int | None = None,
+        markdown_cache_size: int = 4096,
+        modules_memory_budget: int | None = None,
+        keep_loaded_modules: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize the handler.
@@ -223,6 +326,15 @@ class PythonHandler(BaseHandler):
             paths: A list of paths to use as Griffe search paths.
             locale: The locale to use when rendering content.
             load_external_modules: Load external modules when resolving aliases.
+            cache_dir: A directory in which to persist data across builds.
+                Relative paths are relative to the MkDocs configuration file.
+            load_workers: The number of processes used to visit modules when loading packages.
+            format_workers: The number of processes used to format signatures and attributes when rendering.
+            markdown_cache_size: The maximum number of Markdown conversions kept in memory.
+            modules_memory_budget: The approximate memory, in megabytes, that loaded packages can use
+                before the least recently used ones are unloaded.
+            keep_loaded_modules: Whether to keep loaded modules in memory for the next builds in the same process,
+                only reloading the modules that changed.
             **kwargs: Same thing, but with keyword arguments.
         """
         super().__init__(*args, **kwargs)
@@ -263,8 +375,47 @@ class PythonHandler(BaseHandler):
                 search_paths.insert(0, path)
 
         self._paths = search_paths
-        self._modules_collection: ModulesCollection = ModulesCollection()
-        self._lines_collection: LinesCollection = LinesCollection()
+
+        # Make the cache directory relative to the config file path, like search paths.
+        if cache_dir and not os.path.isabs(cache_dir) and config_file_path:
+            cache_dir = os.path.abspath(os.path.join(os.path.dirname(config_file_path), cache_dir))
+        self._cache_dir = cache_dir
+        self._load_workers = load_workers
+        self._format_workers = format_workers or 1
+        self._format_pool: ProcessPoolExecutor | None = None
+        self._fragments_cache = DiskCache(os.path.join(cache_dir, "html")) if cache_dir else None
+        self._highlighted_sources_cache = LRUCache(_HIGHLIGHTED_SOURCES_CACHE_SIZE)
+        self._highlighted_sources_disk_cache = DiskCache(os.path.join(cache_dir, "highlight")) if cache_dir else None
+        self._site_dir: str | None = None
+        self._deferred_sources: dict[str, str] = {}
+        self._written_sources: set[str] = set()
+        # Anchors of summarized members are registered with autorefs, see `split_members_threshold`.
+        self._autorefs: AutorefsPlugin | None = None
+        self._summarized_anchors: set[str] = set()
+        self._rendered_anchors: set[str] = set()
+        self._formatted_code_cache = MemoryCache()
+        if cache_dir:
+            self._formatted_code_cache.load(os.path.join(cache_dir, "formatted-code.pickle"))
+        self._rendering_fingerprint = ""
+        self._markdown_cache = LRUCache(markdown_cache_size)
+        self._markdown_fingerprint = ""
+        self._file_hashes: dict[Path, str] = {}
+        self._keep_loaded_modules = keep_loaded_modules
+        loaded_modules_key = (config_file_path, tuple(search_paths), load_external_modules)
+        loaded_modules = _LOADED_MODULES.get(loaded_modules_key) if keep_loaded_modules else None
+        if loaded_modules is None:
+            loaded_modules = (LazyModulesCollection(), LinesCollection(), ModulesTracker())
+            if keep_loaded_modules:
+                _LOADED_MODULES.set(loaded_modules_key, loaded_modules)
+        self._modules_collection: LazyModulesCollection
+        self._lines_collection: LinesCollection
+        self._modules_tracker: ModulesTracker
+        self._modules_collection, self._lines_collection, self._modules_tracker = loaded_modules
+        self._refreshed_packages: set[str] = set()
+        self._modules_memory_budget = modules_memory_budget
+        self._packages_configs: dict[str, Mapping[str, Any]] = {}
+        self._reloading = False
+        self._compiled_configs: dict[str, Mapping[str, Any]] = {}
         self._locale = locale
 
     @classmethod
@@ -297,20 +448,67 @@ class PythonHandler(BaseHandler):
         for item in Inventory.parse_sphinx(in_file, domain_filter=domains).values():
             yield item.name, posixpath.join(base_url, item.uri)
 
+    def _loading_settings(self, config: Mapping[str, Any], extensions: list[str | dict[str, Any]]) -> str:
+        return fingerprint(
+            extensions,
+            config["docstring_style"],
+            config["docstring_options"],
+            config["allow_inspection"],
+            config["find_stubs_package"],
+            config["targeted_loading"],
+        )
+
+    def _refresh_package(self, package: str, config: Mapping[str, Any]) -> None:
+        # Packages are checked once per build, when they are first collected.
+        self._refreshed_packages.add(package)
+        loader = self._modules_tracker.loaders.get(package)
+        if loader is None:
+            return
+        extensions = self.normalize_extension_paths(config.get("extensions", []))
+        if loader.settings != self._loading_settings(config, extensions):
+            logger.debug(f"Loading settings changed, reloading package {package}")
+            self._modules_collection.unload(package, self._lines_collection)
+            self._modules_tracker.forget(package)
+            return
+        if refreshed := loader.refresh(package):
+            logger.debug(f"Reloaded modules: {', '.join(refreshed)}")
+            self._file_hashes.clear()
+            if self._modules_memory_budget is not None:
+                self._modules_collection.measure(package, self._lines_collection)
+
     def collect(self, identifier: str, config: Mapping[str, Any]) -> CollectorItem:  # noqa: D102
         module_name = identifier.split(".", 1)[0]
+        final_config = ChainMap(config, self.default_config)  # type: ignore[arg-type]
+        fallback = config.get("fallback", False)
+        if not fallback and module_name not in self._refreshed_packages:
+            self._refresh_package(module_name, final_config)
+
         unknown_module = module_name not in self._modules_collection
-        if config.get("fallback", False) and unknown_module:
+        if fallback and unknown_module and module_name not in self._modules_collection.reloaders:
             raise CollectionError("Not loading additional modules during fallback")
 
-        final_config = ChainMap(config, self.default_config)  # type: ignore[arg-type]
         parser_name = final_config["docstring_style"]
         parser_options = final_config["docstring_options"]
         parser = parser_name and Parser(parser_name)
 
         if unknown_module:
+            self._modules_collection.reloaders.pop(module_name, None)
+            loaded_packages = set(self._modules_collection.members)
             extensions = self.normalize_extension_paths(final_config.get("extensions", []))
-            loader = GriffeLoader(
+            modules_cache = None
+            if self._cache_dir:
+                modules_cache = ModulesCache(
+                    os.path.join(self._cache_dir, "modules"),
+                    docstring_parser=parser,
+                    docstring_options=parser_options,
+                    extensions=extensions,
+                )
+            loader = PythonLoader(
+                modules_cache=modules_cache,
+                workers=self._load_workers,
+                extensions_spec=extensions,
+                tracker=self._modules_tracker,
+                settings=self._loading_settings(final_config, extensions),
                 extensions=load_extensions(*extensions),
                 search_paths=self._paths,
                 docstring_parser=parser,
@@ -327,11 +525,23 @@ class PythonHandler(BaseHandler):
                             try_relative_path=False,
                             find_stubs_package=final_config["find_stubs_package"],
                         )
-                loader.load(
-                    module_name,
-                    try_relative_path=False,
-                    find_stubs_package=final_config["find_stubs_package"],
-                )
+                if final_config["targeted_loading"]:
+                    # Register the loader first, so that missing modules
+                    # (for example wildcard imports) can be loaded on demand.
+                    self._modules_collection.loaders[module_name] = loader
+                    loader.load(
+                        module_name,
+                        submodules=False,
+                        try_relative_path=False,
+                        find_stubs_package=final_config["find_stubs_package"],
+                    )
+                    loader.load_module_chain(identifier)
+                else:
+                    loader.load(
+                        module_name,
+                        try_relative_path=False,
+                        find_stubs_package=final_config["find_stubs_package"],
+                    )
             except ImportError as error:
                 raise CollectionError(str(error)) from error
             unresolved, iterations = loader.resolve_aliases(
@@ -341,6 +551,17 @@ class PythonHandler(BaseHandler):
             if unresolved:
                 logger.debug(f"{len(unresolved)} aliases were still unresolved after {iterations} iterations")
                 logger.debug(f"Unresolved aliases: {', '.join(sorted(unresolved))}")
+            if modules_cache:
+                logger.debug(f"Modules cache: {modules_cache.hits} hits, {modules_cache.misses} misses")
+            if self._modules_memory_budget is not None:
+                # Pre-loaded and external packages are measured too, and can be evicted like the collected one,
+                # which is measured last, as the most recently used.
+                new_packages = self._modules_collection.members.keys() - loaded_packages
+                for package in sorted(new_packages, key=module_name.__eq__):
+                    self._modules_collection.measure(package, self._lines_collection)
+                    self._packages_configs[package] = config
+        else:
+            self._modules_collection.touch(module_name)
 
         try:
             doc_object = self._modules_collection[identifier]
@@ -348,25 +569,74 @@ class PythonHandler(BaseHandler):
             raise CollectionError(f"{identifier} could not be found") from error
         except AliasResolutionError as error:
             raise CollectionError(str(error)) from error
+        finally:
+            # Packages are evicted after the lookup, so that modules loaded on demand
+            # by the lookup (with targeted loading) are accounted for.
+            if self._modules_memory_budget is not None and not self._reloading:
+                self._evict_packages(keep=module_name)
 
         if not unknown_module:
             with suppress(AliasResolutionError):
-                if doc_object.docstring is not None:
-                    doc_object.docstring.parser = parser
-                    doc_object.docstring.parser_options = parser_options
+                docstring = doc_object.docstring
+                if docstring is not None and (docstring.parser != parser or docstring.parser_options != parser_options):
+                    docstring.parser = parser
+                    docstring.parser_options = parser_options
+                    # Parse again with the new parser, so that the result
+                    # does not depend on which identifier was rendered first.
+                    docstring.__dict__.pop("parsed", None)
 
         return doc_object
 
-    def render(self, data: CollectorItem, config: Mapping[str, Any]) -> str:  # noqa: D102 (ignore missing docstring)
-        final_config = ChainMap(config, self.default_config)  # type: ignore[arg-type]
+    def _evict_packages(self, keep: str) -> None:
+        # Evicted packages are reloaded on demand (from the modules cache, if enabled):
+        # when collected again, or when an object is looked up in them, for example to resolve an alias.
+        evicted = self._modules_collection.evict(
+            self._modules_memory_budget * 1024 * 1024,  # type: ignore[operator]
+            self._lines_collection,
+            keep=keep,
+        )
+        for package in evicted:
+            self._modules_tracker.forget(package)
+            self._refreshed_packages.discard(package)
+            if (config := self._packages_configs.pop(package, None)) is not None:
+                self._modules_collection.reloaders[package] = partial(self._reload_package, config)
+        if evicted:
+            footprint = self._modules_collection.footprint / 1024 / 1024
+            logger.debug(f"Unloaded packages: {', '.join(evicted)} (loaded packages now use ~{footprint:.1f} MB)")
 
-        template_name = rendering.do_get_template(self.env, data)
-        template = self.env.get_template(template_name)
+    def _reload_package(self, config: Mapping[str, Any], path: str) -> None:
+        # Packages reloaded while rendering do not cause evictions, since evicted packages might be in use.
+        reloading, self._reloading = self._reloading, True
+        try:
+            with suppress(CollectionError):
+                self.collect(path, config)
+        finally:
+            self._reloading = reloading
 
-        # Heading level is a "state" variable, that will change at each step
-        # of the rendering recursion. Therefore, it's easier to use it as a plain value
-        # than as an item in a dictionary.
-        heading_level = final_config["heading_level"]
+    def _current_file(self) -> File | None:
+        # Relative links are rewritten relatively to the current page, by MkDocs' processor.
+        if "relpath" in self._md.treeprocessors:
+            return getattr(self._md.treeprocessors["relpath"], "file", None)
+        return None
+
+    def _fragment_key(self, data: CollectorItem, config: Mapping[str, Any]) -> str:
+        return fingerprint(
+            data.path,
+            object_fingerprint(data, self._file_hashes),
+            dict(config),
+            self._locale,
+            getattr(self._current_file(), "src_uri", None),
+            self._rendering_fingerprint,
+        )
+
+    def _compile_config(self, config: Mapping[str, Any]) -> Mapping[str, Any]:
+        # Many autodoc instructions share the same options:
+        # compile each unique set of options only once.
+        key = fingerprint(dict(config))
+        if (compiled := self._compiled_configs.get(key)) is not None:
+            return compiled
+
+        final_config = {**self.default_config, **config}
         try:
             final_config["members_order"] = rendering.Order(final_config["members_order"])
         except ValueError as error:
@@ -403,15 +673,220 @@ class PythonHandler(BaseHandler):
                 "modules": summary.get("modules", False),
             }
 
-        return template.render(
-            **{
-                "config": final_config,
-                data.kind.value: data,
-                "heading_level": heading_level,
-                "root": True,
-                "locale": self._locale,
-            },
+        compiled = self._compiled_configs[key] = MappingProxyType(final_config)
+        return compiled
+
+    def render(self, data: CollectorItem, config: Mapping[str, Any]) -> str:  # noqa: D102 (ignore missing docstring)
+        # Rendered fragments are cached along with the headings
+        # they register, since those are needed for the table of contents,
+        # and the deferred sources they load, since the site directory is cleaned between builds.
+        fragment_key = None
+        if self._fragments_cache is not None:
+            fragment_key = self._fragment_key(data, config)
+            if (fragment := self._fragments_cache.get(fragment_key)) is not None:
+                html, headings, sources = fragment
+                if sources and self._site_dir is None:
+                    # Without a site directory, deferred sources cannot be written: they are inlined instead,
+                    # and the cached fragment is kept for builds that can write them.
+                    fragment_key = None
+                else:
+                    self._headings.extend(headings)
+                    for name, source in sources.items():
+                        self._write_source(name, source)
+                    return html
+        headings_count = len(self._headings)
+        sources = self._deferred_sources = {}
+
+        template_name = rendering.do_get_template(self.env, data)
+        template = self.env.get_template(template_name)
+
+        # Heading level is a "state" variable, that will change at each step
+        # of the rendering recursion. Therefore, it's easier to use it as a plain value
+        # than as an item in a dictionary.
+        compiled_config = self._compile_config(config)
+        heading_level = compiled_config["heading_level"]
+
+        context = {
+            "config": compiled_config,
+            data.kind.value: data,
+            "heading_level": heading_level,
+            "root": True,
+            "locale": self._locale,
+        }
+        formatter = compiled_config["signature_formatter"]
+        # Signatures and attributes are formatted in batches, once the whole object is rendered.
+        defer_formatting = self._format_workers > 1 or (formatter in formatters and get_formatter(formatter).batched)
+        if self._format_workers > 1 and self._format_pool is None:
+            self._format_pool = ProcessPoolExecutor(max_workers=self._format_workers)
+        html = rendering.render_template(
+            template,
+            context,
+            self._format_pool,
+            defer_formatting=defer_formatting,
+            formatted_code_cache=self._formatted_code_cache,
+        )
+        if fragment_key is not None:
+            self._fragments_cache.set(fragment_key, (html, self._headings[headings_count:], sources))  # type: ignore[union-attr]
+        return html
+
+    def _render_item(self, identifier: str, config: Mapping[str, Any]) -> tuple[str, list[Element]]:
+        headings_count = len(self._headings)
+        html = self.render(self.collect(identifier, config), config)
+        headings = self._headings[headings_count:]
+        del self._headings[headings_count:]
+        return html, headings
+
+    def render_batch(
+        self,
+        items: Iterable[tuple[str, Mapping[str, Any]]],
+        *,
+        workers: int | None = None,
+    ) -> list[tuple[str, list[Element]]]:
+        """Collect and render many objects in parallel, in a pool of processes.
+
+        Modules are loaded in the current process first,
+        then worker processes are forked to render the objects:
+        they inherit loaded modules, the Jinja environment and the Markdown instance,
+        so that results are identical to collecting and rendering objects one by one.
+        When processes cannot be forked (for example on Windows), objects are rendered sequentially.
+
+        Parameters:
+            items: The identifiers of the objects to render, with their configuration.
+            workers: The number of worker processes. Default: the number of CPUs.
+
+        Raises:
+            CollectionError: When an object could not be collected (the first one, in order).
+
+        Returns:
+            For each object, in order, the rendered HTML and the headings it registered
+            (what [`get_headings`][mkdocstrings.handlers.base.BaseHandler.get_headings]
+            would have returned right after rendering it).
+        """
+        items = list(items)
+        workers = min(workers or os.cpu_count() or 1, len(items))
+        if workers < 2 or "fork" not in multiprocessing.get_all_start_methods():  # noqa: PLR2004
+            results = [self._render_item(identifier, config) for identifier, config in items]
+            return [(html, self._register_summarized_members(headings)) for html, headings in results]
+
+        for identifier, config in items:
+            with suppress(CollectionError):
+                self.collect(identifier, config)
+        if self._format_pool is not None:
+            # Forking while the threads of a pool are running could deadlock workers.
+            self._format_pool.shutdown()
+            self._format_pool = None
+
+        formatted_code_cache = self._formatted_code_cache
+        _BATCH.update(handler=self, items=items, formatted_code=formatted_code_cache.entries)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_batch_worker,
+            ) as executor:
+                chunksize = max(1, len(items) // (workers * 4))
+                results = list(executor.map(_render_batch_item, range(len(items)), chunksize=chunksize))
+        finally:
+            _BATCH.clear()
+        for _, _, formatted_code in results:
+            formatted_code_cache.update(formatted_code)
+        return [(html, self._register_summarized_members(headings)) for html, headings, _ in results]
+
+    def do_convert_markdown(  # noqa: D102
+        self,
+        text: str,
+        heading_level: int,
+        html_id: str = "",
+        *,
+        strip_paragraph: bool = False,
+        autoref_hook: AutorefsHookInterface | None = None,
+    ) -> Markup:
+        # The same texts (inherited docstrings, shared parameter descriptions) are converted many times.
+        # Conversions are cached along with the headings they register, since those are needed for the table of contents.
+        # Only links and cross-references (which need brackets) depend on the current page and object.
+        key: tuple = (text, heading_level, strip_paragraph, self._markdown_fingerprint)
+        if "[" in text:
+            context = autoref_hook and (type(autoref_hook), *autoref_hook.get_context().as_dict().items())
+            key += (getattr(self._current_file(), "src_uri", None), context)
+        # Most conversions contain no HTML ids, and are therefore shared by all parent ids.
+        if (*key, None) not in self._markdown_cache.entries:
+            key += (html_id,)
+        else:
+            key += (None,)
+        if (converted := self._markdown_cache.get(key)) is not None:
+            html, headings = converted
+            self._headings.extend(deepcopy(headings))
+            return html
+        headings_count = len(self._headings)
+        html = super().do_convert_markdown(
+            text,
+            heading_level,
+            html_id,
+            strip_paragraph=strip_paragraph,
+            autoref_hook=autoref_hook,
         )
+        headings = self._headings[headings_count:]
+        if not headings and not _ID_ATTRIBUTES.search(html):
+            key = (*key[:-1], None)
+        self._markdown_cache.set(key, (html, deepcopy(headings)))
+        return html
+
+    def _highlight_source(
+        self,
+        highlight: Callable[..., Markup],
+        settings: str,
+        src: str,
+        language: str | None = None,
+        *,
+        inline: bool = False,
+        linenums: bool | None = None,
+        **kwargs: Any,
+    ) -> Markup:
+        # Sources (the only code highlighted with line numbers) are cached by contents,
+        # in memory and on disk, since they rarely change between builds.
+        if inline or not linenums:
+            return highlight(src, language, inline=inline, linenums=linenums, **kwargs)
+        key = fingerprint(
+            hashlib.sha256(src.encode()).hexdigest(),
+            isinstance(src, Markup),
+            language,
+            kwargs,
+            settings,
+        )
+        if (html := self._highlighted_sources_cache.get(key)) is not None:
+            return html
+        disk_cache = self._highlighted_sources_disk_cache
+        if disk_cache is None or (html := disk_cache.get(key)) is None:
+            html = highlight(src, language, inline=inline, linenums=linenums, **kwargs)
+            if disk_cache is not None:
+                disk_cache.set(key, html)
+        self._highlighted_sources_cache.set(key, html)
+        return html
+
+    def _defer_source(self, html: str) -> Markup:
+        # Sources are written to separate files, named after their contents,
+        # and only loaded when their panel is opened. Without a site directory or a page, they are inlined.
+        page = self._current_file()
+        if self._site_dir is None or page is None:
+            return Markup()
+        name = hashlib.sha256(html.encode()).hexdigest()
+        self._deferred_sources[name] = html
+        self._write_source(name, html)
+        url = get_relative_url(f"{_SOURCES_DIR}/{name}.html", page.url)
+        return Markup(' data-src="{}" ontoggle="{}"').format(url, _LOAD_SOURCE_SCRIPT)
+
+    def _write_source(self, name: str, html: str) -> None:
+        # Files named after their contents never change: existing ones are not written again.
+        if name in self._written_sources or self._site_dir is None:
+            return
+        path = Path(self._site_dir, _SOURCES_DIR, f"{name}.html")
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes might write the same file concurrently, see `render_batch`.
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+                file.write(html.encode())
+            os.replace(file.name, path)
+        self._written_sources.add(name)
 
     def update_env(self, md: Markdown, config: dict) -> None:
         """Update the Jinja environment with custom filters and tests.
@@ -424,6 +899,17 @@ class PythonHandler(BaseHandler):
         self.env.trim_blocks = True
         self.env.lstrip_blocks = True
         self.env.keep_trailing_newline = False
+        highlight = self.env.filters["highlight"]
+        settings = fingerprint(
+            [get_version(dist) for dist in ("pygments", "pymdown-extensions")],
+            getattr(getattr(highlight, "__self__", None), "__dict__", {}),
+        )
+        self.env.filters["highlight"] = partial(self._highlight_source, highlight, settings)
+        # Deferred sources are written in the site directory, see `show_source`.
+        if (mkdocs_config := config.get("mkdocs")) is not None:
+            self._site_dir = mkdocs_config["site_dir"]
+            self._autorefs = mkdocs_config["plugins"].get("autorefs")
+        self.env.filters["defer_source"] = self._defer_source
         self.env.filters["split_path"] = rendering.do_split_path
         self.env.filters["crossref"] = rendering.do_crossref
         self.env.filters["multi_crossref"] = rendering.do_multi_crossref
@@ -431,6 +917,7 @@ class PythonHandler(BaseHandler):
         self.env.filters["format_code"] = rendering.do_format_code
         self.env.filters["format_signature"] = rendering.do_format_signature
         self.env.filters["format_attribute"] = rendering.do_format_attribute
+        self.env.filters["render_expression"] = rendering.do_render_expression
         self.env.filters["filter_objects"] = rendering.do_filter_objects
         self.env.filters["stash_crossref"] = rendering.do_stash_crossref
         self.env.filters["get_template"] = rendering.do_get_template
@@ -439,7 +926,70 @@ class PythonHandler(BaseHandler):
         self.env.filters["as_classes_section"] = rendering.do_as_classes_section
         self.env.filters["as_modules_section"] = rendering.do_as_modules_section
         self.env.globals["AutorefsHook"] = rendering.AutorefsHook
-        self.env.tests["existing_template"] = lambda template_name: template_name in self.env.list_templates()
+        self.env.filters["render_native_section"] = docstrings.do_render_native_section
+        self.env.tests["existing_template"] = rendering.do_existing_template
+        self.env.tests["split_members"] = rendering.do_split_members
+        self.env.filters["summarized_members"] = rendering.do_summarized_members
+        self.env.tests["native_section"] = docstrings.do_native_section
+        # Conversions are only reused with the same Markdown extensions.
+        self._markdown_fingerprint = fingerprint(
+            [ext if isinstance(ext, str) else type(ext).__qualname__ for ext in config.get("mdx", ())],
+            config.get("mdx_configs", {}),
+        )
+        # Compiled templates are persisted, to skip compiling them again on the next builds.
+        if self._cache_dir and self.env.bytecode_cache is None:
+            bytecode_dir = os.path.join(self._cache_dir, "jinja", get_version("jinja2"))
+            os.makedirs(bytecode_dir, exist_ok=True)
+            self.env.bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+        # The environment is updated for each page, but the fingerprint does not change between pages.
+        if self._fragments_cache is not None and not self._rendering_fingerprint:
+            self._rendering_fingerprint = fingerprint(
+                [get_version(dist) for dist in _RENDERING_DISTRIBUTIONS],
+                [ext if isinstance(ext, str) else type(ext).__qualname__ for ext in config.get("mdx", ())],
+                config.get("mdx_configs", {}),
+                directories_fingerprint(self.env.loader.searchpath),  # type: ignore[union-attr]
+            )
+
+    def get_headings(self) -> Sequence[Element]:
+        """Return and clear the headings gathered so far.
+
+        Hidden headings of summarized members (see the `split_members_threshold` option) are not returned:
+        their anchors are registered as secondary anchors instead, so that cross-references to the members
+        resolve to the summaries, unless the members are documented elsewhere.
+
+        Returns:
+            A list of HTML elements.
+        """
+        return self._register_summarized_members(super().get_headings())
+
+    def _register_summarized_members(self, headings: Sequence[Element]) -> list[Element]:
+        rendered = []
+        summarized: dict[str, list[str]] = {}
+        for heading in headings:
+            anchor = heading.attrib["id"]
+            if heading.get("data-summarized") is None:
+                rendered.append(heading)
+                self._rendered_anchors.add(anchor)
+            else:
+                summarized.setdefault(anchor.rpartition(".")[0], []).append(anchor)
+        page = self._autorefs.current_page if self._autorefs else None
+        for parent, anchors in summarized.items():
+            # Not a warning: members are typically documented on other pages, which would fail strict builds.
+            logger.info(
+                f"{parent}: {len(anchors)} members are only summarized, "
+                "their documentation is not rendered (see split_members_threshold)",
+            )
+            self._summarized_anchors.update(anchors)
+            if page is None:
+                continue
+            for anchor in anchors:
+                try:
+                    identifiers = self.get_anchors(self.collect(anchor, self.fallback_config))
+                except CollectionError:
+                    identifiers = (anchor,)
+                for identifier in identifiers:
+                    self._autorefs.register_anchor(page, identifier, anchor, primary=False)  # type: ignore[union-attr]
+        return rendered
 
     def get_anchors(self, data: CollectorItem) -> tuple[str, ...]:  # noqa: D102 (ignore missing docstring)
         anchors = [data.path]
@@ -451,8 +1001,48 @@ class PythonHandler(BaseHandler):
                     anchors.append(anchor)
         except AliasResolutionError:
             return tuple(anchors)
+        # Members of summarized members are not rendered (see `split_members_threshold`),
+        # unless they are documented elsewhere: cross-references to them fall back to the summaries.
+        if self._summarized_anchors and data.path not in self._rendered_anchors:
+            parent = data.parent
+            while parent is not None:
+                if parent.path in self._summarized_anchors:
+                    anchors.append(parent.path)
+                    break
+                parent = parent.parent
         return tuple(anchors)
 
+    def teardown(self) -> None:
+        """Teardown the handler.
+
+        Loaded packages are released, unless they are kept for the next builds
+        (in which case they are checked for changes again during the next build),
+        and formatted code is persisted if a cache directory is configured.
+        """
+        self._refreshed_packages.clear()
+        self._written_sources.clear()
+        self._summarized_anchors.clear()
+        self._rendered_anchors.clear()
+        cache = self._markdown_cache
+        if cache.hits or cache.misses:
+            logger.debug(f"Markdown cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%} hit rate)")
+        cache = self._highlighted_sources_cache
+        if cache.hits or cache.misses:
+            logger.debug(f"Sources cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%} hit rate)")
+        if self._modules_memory_budget is not None and (footprints := self._modules_collection.footprints):
+            footprint = self._modules_collection.footprint / 1024 / 1024
+            logger.debug(f"Loaded packages: {len(footprints)}, using ~{footprint:.1f} MB")
+        if not self._keep_loaded_modules:
+            self._modules_collection = LazyModulesCollection()
+            self._lines_collection = LinesCollection()
+            self._modules_tracker = ModulesTracker()
+            self._packages_configs.clear()
+        if self._format_pool is not None:
+            self._format_pool.shutdown()
+            self._format_pool = None
+        if self._cache_dir:
+            self._formatted_code_cache.save()
+
     def normalize_extension_paths(self, extensions: Sequence) -> Sequence:
         """Resolve extension paths relative to config file."""
         if self._config_file_path is None:
@@ -491,6 +1081,12 @@ def get_handler(
     paths: list[str] | None = None,
     locale: str = "en",
     load_external_modules: bool | None = None,
+    cache_dir: str | None = None,
+    load_workers: int | None = None,
+    format_workers: int | None = None,
+    markdown_cache_size: int = 4096,
+    modules_memory_budget: int | None = None,
+    keep_loaded_modules: bool = False,
     **config: Any,  # noqa: ARG001
 ) -> PythonHandler:
     """Simply return an instance of `PythonHandler`.
@@ -502,6 +1098,14 @@ def get_handler(
         paths: A list of paths to use as Griffe search paths.
         locale: The locale to use when rendering content.
         load_external_modules: Load external modules when resolving aliases.
+        cache_dir: A directory in which to persist data across builds.
+        load_workers: The number of processes used to visit modules when loading packages.
+        format_workers: The number of processes used to format signatures and attributes when rendering.
+        markdown_cache_size: The maximum number of Markdown conversions kept in memory.
+        modules_memory_budget: The approximate memory, in megabytes, that loaded packages can use
+            before the least recently used ones are unloaded.
+        keep_loaded_modules: Whether to keep loaded modules in memory for the next builds in the same process,
+            only reloading the modules that changed.
         **config: Configuration passed to the handler.
 
     Returns:
@@ -515,4 +1119,10 @@ def get_handler(
         paths=paths,
         locale=locale,
         load_external_modules=load_external_modules,
+        cache_dir=cache_dir,
+        load_workers=load_workers,
+        format_workers=format_workers,
+        markdown_cache_size=markdown_cache_size,
+        modules_memory_budget=modules_memory_budget,
+        keep_loaded_modules=keep_loaded_modules,
     )
@@ -0,0 +1,199 @@
+"""This module implements a fast highlighter for signatures and attributes.
+
+It produces the same HTML as Pygments' Python lexer and HTML formatter,
+for the subset of Python found in signatures and attributes values:
+names, operators, punctuation, numbers, and simple strings.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Word lists and token rules are those of Pygments' Python lexer.
+# fmt: off
+_KEYWORDS = frozenset({
+    "assert", "async", "await", "break", "continue", "del", "elif", "else", "except", "finally", "for", "global",
+    "if", "lambda", "pass", "raise", "nonlocal", "return", "try", "while", "as", "with",
+})
+_CONSTANTS = frozenset(("True", "False", "None"))
+_OPERATOR_WORDS = frozenset(("in", "is", "and", "or", "not"))
+# Keywords starting statements (or multi-word keywords) that we do not support.
+_UNSUPPORTED_WORDS = frozenset(("def", "class", "from", "import", "yield"))
+# Soft keywords, that we do not support at the beginning of lines.
+_SOFT_KEYWORDS = frozenset(("match", "case"))
+_BUILTINS = frozenset({
+    "__import__", "abs", "aiter", "all", "any", "bin", "bool", "bytearray", "breakpoint", "bytes", "callable",
+    "chr", "classmethod", "compile", "complex", "delattr", "dict", "dir", "divmod", "enumerate", "eval", "filter",
+    "float", "format", "frozenset", "getattr", "globals", "hasattr", "hash", "hex", "id", "input", "int",
+    "isinstance", "issubclass", "iter", "len", "list", "locals", "map", "max", "memoryview", "min", "next",
+    "object", "oct", "open", "ord", "pow", "print", "property", "range", "repr", "reversed", "round", "set",
+    "setattr", "slice", "sorted", "staticmethod", "str", "sum", "super", "tuple", "type", "vars", "zip",
+})
+_PSEUDO_BUILTINS = frozenset(("self", "Ellipsis", "NotImplemented", "cls"))
+_EXCEPTIONS = frozenset({
+    "ArithmeticError", "AssertionError", "AttributeError", "BaseException", "BufferError", "BytesWarning",
+    "DeprecationWarning", "EOFError", "EnvironmentError", "Exception", "FloatingPointError", "FutureWarning",
+    "GeneratorExit", "IOError", "ImportError", "ImportWarning", "IndentationError", "IndexError", "KeyError",
+    "KeyboardInterrupt", "LookupError", "MemoryError", "NameError", "NotImplementedError", "OSError",
+    "OverflowError", "PendingDeprecationWarning", "ReferenceError", "ResourceWarning", "RuntimeError",
+    "RuntimeWarning", "StopIteration", "SyntaxError", "SyntaxWarning", "SystemError", "SystemExit", "TabError",
+    "TypeError", "UnboundLocalError", "UnicodeDecodeError", "UnicodeEncodeError", "UnicodeError",
+    "UnicodeTranslateError", "UnicodeWarning", "UserWarning", "ValueError", "VMSError", "Warning", "WindowsError",
+    "ZeroDivisionError", "BlockingIOError", "ChildProcessError", "ConnectionError", "BrokenPipeError",
+    "ConnectionAbortedError", "ConnectionRefusedError", "ConnectionResetError", "FileExistsError",
+    "FileNotFoundError", "InterruptedError", "IsADirectoryError", "NotADirectoryError", "PermissionError",
+    "ProcessLookupError", "TimeoutError", "StopAsyncIteration", "ModuleNotFoundError", "RecursionError",
+    "EncodingWarning",
+})
+_MAGIC_FUNCTIONS = frozenset({
+    "__abs__", "__add__", "__aenter__", "__aexit__", "__aiter__", "__and__", "__anext__", "__await__", "__bool__",
+    "__bytes__", "__call__", "__complex__", "__contains__", "__del__", "__delattr__", "__delete__", "__delitem__",
+    "__dir__", "__divmod__", "__enter__", "__eq__", "__exit__", "__float__", "__floordiv__", "__format__", "__ge__",
+    "__get__", "__getattr__", "__getattribute__", "__getitem__", "__gt__", "__hash__", "__iadd__", "__iand__",
+    "__ifloordiv__", "__ilshift__", "__imatmul__", "__imod__", "__imul__", "__index__", "__init__",
+    "__instancecheck__", "__int__", "__invert__", "__ior__", "__ipow__", "__irshift__", "__isub__", "__iter__",
+    "__itruediv__", "__ixor__", "__le__", "__len__", "__length_hint__", "__lshift__", "__lt__", "__matmul__",
+    "__missing__", "__mod__", "__mul__", "__ne__", "__neg__", "__new__", "__next__", "__or__", "__pos__", "__pow__",
+    "__prepare__", "__radd__", "__rand__", "__rdivmod__", "__repr__", "__reversed__", "__rfloordiv__",
+    "__rlshift__", "__rmatmul__", "__rmod__", "__rmul__", "__ror__", "__round__", "__rpow__", "__rrshift__",
+    "__rshift__", "__rsub__", "__rtruediv__", "__rxor__", "__set__", "__setattr__", "__setitem__", "__str__",
+    "__sub__", "__subclasscheck__", "__truediv__", "__xor__",
+})
+_MAGIC_VARIABLES = frozenset({
+    "__annotations__", "__bases__", "__class__", "__closure__", "__code__", "__defaults__", "__dict__", "__doc__",
+    "__file__", "__func__", "__globals__", "__kwdefaults__", "__module__", "__mro__", "__name__", "__objclass__",
+    "__qualname__", "__self__", "__slots__", "__weakref__",
+})
+# fmt: on
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<whitespace>\s+)
+    | (?P<unsupported_string>(?i:rb|br|rf|fr|r|u|b|f)?(?:'''|\"\"\")|(?i:rf|fr|f)['"])
+    | (?P<prefix>(?i:rb|br|r|u|b)?)(?:(?P<single>'[^'\\%{}\n]*')|(?P<double>"[^"\\%{}\n]*"))
+    | (?P<float>(?:\d(?:_?\d)*\.(?:\d(?:_?\d)*)?|(?:\d(?:_?\d)*)?\.\d(?:_?\d)*)(?:[eE][+-]?\d(?:_?\d)*)?
+        |\d(?:_?\d)*[eE][+-]?\d(?:_?\d)*j?)
+    | (?P<oct>0[oO](?:_?[0-7])+)
+    | (?P<bin>0[bB](?:_?[01])+)
+    | (?P<hex>0[xX](?:_?[a-fA-F0-9])+)
+    | (?P<int>\d(?:_?\d)*)
+    | (?P<operator>!=|==|<<|>>|:=|[-~+/*%=<>&^|.])
+    | (?P<punctuation>[]{}:(),;[])
+    | (?P<name>[^\W\d]\w*)
+    """,
+    re.VERBOSE,
+)
+
+_CSS_CLASSES = {
+    "single": "s1",
+    "double": "s2",
+    "float": "mf",
+    "oct": "mo",
+    "bin": "mb",
+    "hex": "mh",
+    "int": "mi",
+    "operator": "o",
+    "punctuation": "p",
+}
+
+
+def _escape(text: str) -> str:
+    # Same escaping as Pygments' HTML formatter.
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def _name_class(code: str, start: int, name: str) -> str | None:
+    # Return the CSS class of a name, or none if it is not supported.
+    if name in _UNSUPPORTED_WORDS:
+        return None
+    if name in _SOFT_KEYWORDS and not code[code.rfind("\n", 0, start) + 1 : start].strip():
+        return None
+    if name in _KEYWORDS:
+        return "k"
+    if name in _CONSTANTS:
+        return "kc"
+    if name in _OPERATOR_WORDS:
+        return "ow"
+    if not (start and code[start - 1] == "."):
+        if name in _BUILTINS:
+            return "nb"
+        if name in _PSEUDO_BUILTINS:
+            return "bp"
+        if name in _EXCEPTIONS:
+            return "ne"
+    if name in _MAGIC_FUNCTIONS:
+        return "fm"
+    if name in _MAGIC_VARIABLES:
+        return "vm"
+    return "n"
+
+
+def highlight(code: str, crossrefs: Mapping[str, str] | None = None, *, function: bool = False) -> str | None:
+    """Highlight Python code, producing the same HTML as Pygments.
+
+    The returned HTML is the content of the `code` element that Pygments would produce,
+    without the trailing line break.
+
+    Parameters:
+        code: The code to highlight.
+        crossrefs: Rendered cross-references to insert in place of the names they were stashed as.
+        function: Whether the code is a signature, in which case the first name is highlighted as a function name.
+
+    Returns:
+        The highlighted code, or none if the code contains unsupported syntax.
+    """
+    crossrefs = crossrefs or {}
+    parts = []
+    current_class = None
+    position = 0
+    length = len(code)
+    while position < length:
+        match = _TOKEN_RE.match(code, position)
+        if match is None or match.lastgroup == "unsupported_string":
+            return None
+        kind = match.lastgroup
+        text = match.group(0)
+        start, position = position, match.end()
+
+        if kind == "whitespace":
+            css_class, html = "", text
+        elif kind == "name":
+            css_class = _name_class(code, start, text)  # type: ignore[assignment]
+            if css_class is None:
+                return None
+            if css_class == "n" and function:
+                css_class = "nf"
+                function = False
+            html = crossrefs.get(text) or _escape(text)
+        elif kind in {"single", "double"}:
+            if prefix := match.group("prefix"):
+                if current_class:
+                    parts.append("</span>")
+                parts.append(f'<span class="sa">{prefix}</span>')
+                current_class = None
+            css_class, html = _CSS_CLASSES[kind], _escape(text[len(prefix) :])  # type: ignore[index]
+        else:
+            css_class, html = _CSS_CLASSES[kind], _escape(text)  # type: ignore[index]
+
+        # Like Pygments, we merge consecutive tokens of the same class.
+        if css_class != current_class:
+            if current_class:
+                parts.append("</span>")
+            if css_class:
+                parts.append(f'<span class="{css_class}">')
+            current_class = css_class
+        parts.append(html)
+
+    if current_class:
+        parts.append("</span>")
+    return "".join(parts)
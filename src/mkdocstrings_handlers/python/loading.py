@@ -0,0 +1,831 @@
+"""This module implements loading utilities built on top of Griffe's loader."""
+
+from __future__ import annotations
+
+import enum
+import hashlib
+import pickle
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from functools import cache
+from importlib import metadata
+from importlib.util import find_spec
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import TYPE_CHECKING, Any
+
+from griffe import (
+    Alias,
+    AliasResolutionError,
+    CyclicAliasError,
+    GriffeLoader,
+    LinesCollection,
+    LoadingError,
+    Module,
+    ModulesCollection,
+    Object,
+    load_extensions,
+    visit,
+)
+from mkdocstrings.loggers import get_logger
+
+from mkdocstrings_handlers.python.caching import DiskCache, fingerprint
+from mkdocstrings_handlers.python.debug import get_version
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterator, Sequence
+
+    from griffe import Parser
+
+logger = get_logger(__name__)
+
+
+@contextmanager
+def _detached(module: Module) -> Iterator[Module]:
+    # Detach the module from its parent and collections,
+    # so that serializing it does not serialize the whole tree.
+    parent, module.parent = module.parent, None
+    lines_collection, module._lines_collection = module._lines_collection, None
+    modules_collection, module._modules_collection = module._modules_collection, None
+    try:
+        yield module
+    finally:
+        module.parent = parent
+        module._lines_collection = lines_collection
+        module._modules_collection = modules_collection
+
+
+def _visit_detached(  # noqa: PLR0917
+    module_name: str,
+    filepath: Path,
+    parents: Sequence[str],
+    docstring_parser: Parser | None,
+    docstring_options: dict[str, Any],
+    extensions: Sequence[str | dict[str, Any]],
+) -> bytes | None:
+    # Visit a module in a worker process, and return it serialized.
+    # Parents are only created so that the module gets the right path,
+    # which is required to resolve relative imports.
+    try:
+        code = filepath.read_text(encoding="utf8")
+        lines_collection = LinesCollection()
+        lines_collection[filepath] = code.splitlines(keepends=False)
+        parent = None
+        for parent_name in parents:
+            parent = Module(parent_name, parent=parent)
+        module = visit(
+            module_name,
+            filepath=filepath,
+            code=code,
+            extensions=load_extensions(*extensions),
+            parent=parent,
+            docstring_parser=docstring_parser,
+            docstring_options=docstring_options,
+            lines_collection=lines_collection,
+        )
+        with _detached(module):
+            return pickle.dumps(module, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:  # noqa: BLE001
+        # The module will be visited again in the main process,
+        # which will report the error.
+        return None
+
+
+@cache
+def _packages_distributions() -> dict[str, list[str]]:
+    # Map top-level modules to the distributions providing them (computed once, like in `importlib.metadata`).
+    if hasattr(metadata, "packages_distributions"):
+        return metadata.packages_distributions()
+    distributions = defaultdict(list)
+    for distribution in metadata.distributions():
+        for name in (distribution.read_text("top_level.txt") or "").split():
+            distributions[name].append(distribution.metadata["Name"])
+    return dict(distributions)
+
+
+def _file_hash(path: str | None) -> str | None:
+    if path is None:
+        return None
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _extension_state(extension: str | dict[str, Any]) -> tuple:
+    # The state of an extension's code: the contents of the file of path-based extensions,
+    # the versions of the distributions providing module-based ones, or the contents
+    # of their top-level module when they are not installed (local modules).
+    name = str(next(iter(extension)) if isinstance(extension, dict) else extension)
+    if name.endswith(".py") or ".py:" in name or "/" in name or "\\" in name:
+        path = name.rsplit(".py:", 1)[0] if ".py:" in name else name
+        if not path.endswith(".py"):
+            path += ".py"
+        return name, _file_hash(path)
+    module = name.split(":", 1)[0].split(".", 1)[0]
+    if distributions := _packages_distributions().get(module):
+        return name, [get_version(distribution) for distribution in distributions]
+    try:
+        spec = find_spec(module)
+    except (ImportError, ValueError):
+        spec = None
+    return name, _file_hash(spec and spec.origin)
+
+
+class ModulesCache:
+    """A persistent cache of visited modules.
+
+    Each module is stored on its own, without its submodules,
+    and is keyed by its name and file path.
+    An entry is only reused when the file's modification time, size and contents,
+    the handler and Griffe versions, the docstring parser, its options,
+    the enabled extensions and their code (the contents of extension files,
+    or the versions of installed extensions) are all the same as when the entry was stored.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        *,
+        docstring_parser: Parser | None = None,
+        docstring_options: dict[str, Any] | None = None,
+        extensions: Sequence[str | dict[str, Any]] = (),
+    ) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory in which to store entries.
+            docstring_parser: The docstring parser used when visiting modules.
+            docstring_options: The docstring parser options.
+            extensions: The (normalized) Griffe extensions specification.
+        """
+        self.store: DiskCache = DiskCache(directory)
+        """The underlying on-disk store."""
+        self.hits: int = 0
+        """Number of modules loaded from the cache."""
+        self.misses: int = 0
+        """Number of modules that had to be visited."""
+        self._environment = (
+            get_version("mkdocstrings-python"),
+            get_version("griffe"),
+            sys.version_info[:2],
+            docstring_parser and docstring_parser.value,
+            docstring_options or {},
+            list(extensions),
+            [_extension_state(extension) for extension in extensions],
+        )
+
+    def _fingerprint(self, filepath: Path, code: bytes) -> str:
+        stat = filepath.stat()
+        return fingerprint(stat.st_mtime_ns, stat.st_size, hashlib.sha256(code).hexdigest(), self._environment)
+
+    def get(self, module_name: str, filepath: Path, code: bytes) -> Module | None:
+        """Get a module from the cache.
+
+        Parameters:
+            module_name: The module name.
+            filepath: The module file path.
+            code: The current contents of the module file.
+
+        Returns:
+            A detached module (without parent), or none if the cache has no up-to-date entry for it.
+        """
+        key = fingerprint(module_name, str(filepath))
+        entry = self.store.get(key)
+        if entry is None or entry[0] != self._fingerprint(filepath, code):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, module: Module, filepath: Path, code: bytes) -> None:
+        """Store a freshly visited module in the cache.
+
+        Parameters:
+            module: The module, without submodules.
+            filepath: The module file path.
+            code: The contents of the module file.
+        """
+        key = fingerprint(module.name, str(filepath))
+        with _detached(module):
+            self.store.set(key, (self._fingerprint(filepath, code), module))
+
+
+class ModulesTracker:
+    """Track the files of loaded modules, to find which ones changed since they were loaded."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.files: dict[Path, tuple[str, int, int]] = {}
+        """The tracked files, with the path of their module, their modification time and size."""
+        self.loaders: dict[str, PythonLoader] = {}
+        """The loaders that loaded each package, by package name."""
+
+    def track(self, module_path: str, filepath: Path, loader: PythonLoader) -> None:
+        """Track the file of a module.
+
+        Parameters:
+            module_path: The module path.
+            filepath: The module file path.
+            loader: The loader that loaded the module.
+        """
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return
+        self.files[filepath] = (module_path, stat.st_mtime_ns, stat.st_size)
+        self.loaders[module_path.split(".", 1)[0]] = loader
+
+    def changes(self, package: str) -> list[tuple[str, Path]]:
+        """Find the modules of a package whose files were modified or deleted.
+
+        Parameters:
+            package: The package name.
+
+        Returns:
+            The paths of the changed modules and their file paths, parents first.
+        """
+        changed = []
+        for filepath, (module_path, mtime, size) in self.files.items():
+            if module_path.split(".", 1)[0] != package:
+                continue
+            try:
+                stat = filepath.stat()
+            except OSError:
+                changed.append((module_path, filepath))
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+                changed.append((module_path, filepath))
+        return sorted(changed, key=lambda change: change[0].count("."))
+
+    def forget(self, package: str) -> None:
+        """Stop tracking the files of a package.
+
+        Parameters:
+            package: The package name.
+        """
+        self.files = {path: data for path, data in self.files.items() if data[0].split(".", 1)[0] != package}
+        self.loaders.pop(package, None)
+
+
+def _unlink_aliases(obj: Object) -> None:
+    # Reset the aliases pointing to an object or its members (except submodules),
+    # so that they are resolved again, lazily, the next time they are accessed.
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        for alias in current.aliases.values():
+            alias._target = None
+            alias.__dict__.pop("inherited_members", None)
+        current.aliases.clear()
+        stack.extend(member for member in current.members.values() if not member.is_alias and not member.is_module)
+
+
+def _unlink_module(module: Module) -> None:
+    # Same thing, including submodules.
+    _unlink_aliases(module)
+    for member in module.members.values():
+        if not member.is_alias and member.is_module:
+            _unlink_module(member)
+
+
+def _module_files(module: Module) -> Iterator[Path]:
+    # Yield the file paths of a module and its submodules.
+    stack = [module]
+    while stack:
+        current = stack.pop()
+        if isinstance(current.filepath, Path):
+            yield current.filepath
+        stack.extend(member for member in current.members.values() if not member.is_alias and member.is_module)
+
+
+def _drop_inheritance_caches(collection: ModulesCollection) -> None:
+    # Inherited members and resolved bases are cached by Griffe:
+    # drop them so that they are computed again from reloaded classes.
+    stack: list[Object | Alias] = list(collection.members.values())
+    while stack:
+        obj = stack.pop()
+        obj.__dict__.pop("inherited_members", None)
+        if not obj.is_alias:
+            obj.__dict__.pop("resolved_bases", None)
+            stack.extend(obj.members.values())
+
+
+# Values that are not part of a package's footprint: they are shared with other packages, or not owned by any.
+_SHARED_TYPES = (
+    Object,
+    Alias,
+    ModulesCollection,
+    LinesCollection,
+    GriffeLoader,
+    type,
+    enum.Enum,
+    ModuleType,
+    FunctionType,
+    BuiltinFunctionType,
+)
+_ATOMIC_TYPES = (str, bytes, int, float, Path)
+
+
+def _values_size(values: list[Any], seen: set[int]) -> int:
+    # Sum the sizes of the given values and of everything they reference, stopping at shared values.
+    size = 0
+    while values:
+        value = values.pop()
+        if id(value) in seen or isinstance(value, _SHARED_TYPES):
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, _ATOMIC_TYPES):
+            continue
+        if isinstance(value, dict):
+            values.extend(value.keys())
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            values.extend(value)
+        else:
+            # Instances of classes with slots, like Griffe expressions, or with a dictionary.
+            if hasattr(value, "__dict__"):
+                values.append(vars(value))
+            for cls in type(value).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot not in {"__dict__", "__weakref__"} and hasattr(value, slot):
+                        values.append(getattr(value, slot))
+    return size
+
+
+def estimate_footprint(
+    module: Module,
+    lines_collection: LinesCollection | None = None,
+    *,
+    submodules: bool = True,
+) -> int:
+    """Estimate the memory used by a loaded module.
+
+    The estimate is the size of the module, its members, everything they reference
+    (docstrings, parameters, expressions, etc.), and the source lines of the module and its submodules.
+    Objects of other modules (parents, targets of aliases) are not counted.
+
+    Parameters:
+        module: The module.
+        lines_collection: The collection holding source lines, if they should be counted.
+        submodules: Whether to count the submodules of the module as well.
+
+    Returns:
+        An estimate of the used memory, in bytes.
+    """
+    seen: set[int] = set()
+    size = 0
+    objects: list[Object | Alias] = [module]
+    while objects:
+        obj = objects.pop()
+        size += sys.getsizeof(obj)
+        values = []
+        for name, value in vars(obj).items():
+            if name == "members":
+                size += sys.getsizeof(value)
+                objects.extend(
+                    member for member in value.values() if submodules or member.is_alias or not member.is_module
+                )
+            elif name not in {"_parent", "parent", "_target"}:
+                values.append(value)
+        if lines_collection is not None and not obj.is_alias and obj.is_module:
+            filepath = obj.filepath
+            if isinstance(filepath, Path) and filepath in lines_collection:
+                values.append(lines_collection[filepath])
+        size += _values_size(values, seen)
+    return size
+
+
+class PythonLoader(GriffeLoader):
+    """A Griffe loader supporting the handler's loading strategies."""
+
+    def __init__(
+        self,
+        *,
+        modules_cache: ModulesCache | None = None,
+        workers: int | None = None,
+        extensions_spec: Sequence[str | dict[str, Any]] = (),
+        tracker: ModulesTracker | None = None,
+        settings: str = "",
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the loader.
+
+        Parameters:
+            modules_cache: An optional persistent cache of visited modules.
+            workers: The number of processes used to visit modules. Modules are visited sequentially when 1 or less.
+            extensions_spec: The specification of the loaded extensions, used to load them again in worker processes.
+            tracker: An optional tracker of the loaded files, used to reload modules when their files change.
+            settings: A fingerprint of the loading settings, to tell whether loaded modules can be reused.
+            **kwargs: See [`GriffeLoader`][griffe.GriffeLoader].
+        """
+        super().__init__(**kwargs)
+        self.modules_cache: ModulesCache | None = modules_cache
+        """The persistent cache of visited modules."""
+        self.workers: int = workers or 1
+        """The number of processes used to visit modules."""
+        self.extensions_spec: Sequence[str | dict[str, Any]] = extensions_spec
+        """The specification of the loaded extensions."""
+        self.tracker: ModulesTracker | None = tracker
+        """The tracker of the loaded files."""
+        self.settings: str = settings
+        """A fingerprint of the loading settings."""
+        self._previsited: dict[Path, tuple[Module, list[str]]] = {}
+        self._submodules: dict[str, dict[tuple[str, ...], list[Path]]] = {}
+        self._loaded_submodules: dict[str, set[tuple[str, ...]]] = {}
+
+    def _submodules_index(self, package: Module) -> dict[tuple[str, ...], list[Path]]:
+        # Finding submodules only lists directories, it does not parse any file.
+        if package.name not in self._submodules:
+            index: dict[tuple[str, ...], list[Path]] = {}
+            for subparts, subpath in self.finder.submodules(package):
+                index.setdefault(subparts, []).append(subpath)
+            self._submodules[package.name] = index
+            self._loaded_submodules.setdefault(package.name, set())
+        return self._submodules[package.name]
+
+    def load_module_chain(self, path: str) -> list[Module]:
+        """Load the modules leading to the given object path, in an already loaded package.
+
+        Only the modules whose name is a prefix of the given path are loaded.
+        If the path itself points to a module, its submodules are loaded as well.
+
+        Parameters:
+            path: The path of an object.
+
+        Returns:
+            The newly loaded modules.
+        """
+        parts = path.split(".")
+        try:
+            package = self.modules_collection.members[parts[0]]
+        except KeyError:
+            return []
+        index = self._submodules_index(package)
+        loaded = self._loaded_submodules[package.name]
+
+        to_load = []
+        for depth in range(2, len(parts) + 1):
+            subparts = tuple(parts[1:depth])
+            if subparts not in index:
+                break
+            to_load.append(subparts)
+        else:
+            # The path points to a module: load its whole subtree.
+            prefix = tuple(parts[1:])
+            to_load.extend(subparts for subparts in index if subparts[: len(prefix)] == prefix)
+
+        to_load = [subparts for subparts in to_load if subparts not in loaded]
+        self._previsit(package, [(subparts, subpath) for subparts in to_load for subpath in index[subparts]])
+        new_modules = []
+        for subparts in to_load:
+            loaded.add(subparts)
+            for subpath in index[subparts]:
+                self._load_submodule(package, subparts, subpath)
+            try:
+                new_modules.append(package.get_member(subparts))
+            except KeyError:
+                logger.debug(f"Could not load module {package.name}.{'.'.join(subparts)}")
+        self._previsited.clear()
+        for module in new_modules:
+            self.expand_exports(module)
+            self.expand_wildcards(module, external=False)
+        return new_modules
+
+    def _previsit(self, package: Module, submodules: Sequence[tuple[tuple[str, ...], Path]]) -> None:
+        # Visit the given submodules of a package ahead of time, in a pool of processes.
+        # The sequential loading logic then picks up the visited modules in `_visit_module`.
+        if self.workers <= 1 or self.force_inspection:
+            return
+        to_visit = []
+        for subparts, subpath in submodules:
+            if subpath.suffix not in {".py", ".pyi"} or any("." in subpart for subpart in subparts):
+                continue
+            if self.modules_cache is not None:
+                code = subpath.read_bytes()
+                if (module := self.modules_cache.get(subparts[-1], subpath, code)) is not None:
+                    self._previsited[subpath] = (module, code.decode("utf8").splitlines(keepends=False))
+                    continue
+            parents = [*package.path.split("."), *subparts[:-1]]
+            to_visit.append((subparts[-1], subpath, parents))
+        if len(to_visit) < 2:  # noqa: PLR2004
+            return
+
+        logger.debug(f"Visiting {len(to_visit)} modules of {package.path} with {self.workers} workers")
+        names, paths, parents = zip(*to_visit)
+        size = len(to_visit)
+        with ProcessPoolExecutor(max_workers=min(self.workers, size)) as executor:
+            results = executor.map(
+                _visit_detached,
+                names,
+                paths,
+                parents,
+                [self.docstring_parser] * size,
+                [self.docstring_options] * size,
+                [list(self.extensions_spec)] * size,
+                chunksize=max(1, size // (self.workers * 4)),
+            )
+            for name, path, data in zip(names, paths, results):
+                if data is None:
+                    continue
+                module = pickle.loads(data)  # noqa: S301
+                code = path.read_bytes()
+                if self.modules_cache is not None:
+                    self.modules_cache.set(module, path, code)
+                self._previsited[path] = (module, code.decode("utf8").splitlines(keepends=False))
+                logger.debug(f"Visited {name} ({path}) in a worker process")
+
+    def expand_wildcards(self, obj: Object, *, external: bool | None = None, seen: set | None = None) -> None:
+        """Expand wildcards: try to recursively expand all found wildcards.
+
+        In partially loaded packages, the modules targeted by wildcard imports
+        are loaded beforehand, since loading them while expanding wildcards
+        would change the members being iterated on.
+
+        Parameters:
+            obj: The object and its members to recurse on.
+            external: When true, try to load unspecified modules to expand wildcards.
+            seen: Used to avoid infinite recursion.
+        """
+        if seen is None and getattr(self.modules_collection, "loaders", None):
+            stack, visited = [obj], set()
+            while stack:
+                current = stack.pop()
+                visited.add(current.path)
+                for member in list(current.members.values()):
+                    if member.is_alias and member.wildcard and member.target_path not in visited:  # type: ignore[union-attr]
+                        with suppress(KeyError, AliasResolutionError, CyclicAliasError):
+                            stack.append(self.modules_collection.get_member(member.target_path))  # type: ignore[union-attr]
+        super().expand_wildcards(obj, external=external, seen=seen)
+
+    def _load_submodules(self, module: Module) -> None:
+        submodules = self.finder.submodules(module)
+        self._previsit(module, submodules)
+        try:
+            for subparts, subpath in submodules:
+                self._load_submodule(module, subparts, subpath)
+        finally:
+            self._previsited.clear()
+
+    def _attach(self, module: Module, module_path: Path, lines: list[str], parent: Module | None) -> Module:
+        module.parent = parent
+        module._lines_collection = self.lines_collection
+        module._modules_collection = self.modules_collection
+        if self.store_source:
+            self.lines_collection[module_path] = lines
+        return module
+
+    def _visit_module(self, module_name: str, module_path: Path, parent: Module | None = None) -> Module:
+        module = self._visit_module_cached(module_name, module_path, parent)
+        if self.tracker is not None:
+            self.tracker.track(module.path, module_path, self)
+        return module
+
+    def _visit_module_cached(self, module_name: str, module_path: Path, parent: Module | None) -> Module:
+        if module_path in self._previsited:
+            module, lines = self._previsited.pop(module_path)
+            return self._attach(module, module_path, lines, parent)
+        if self.modules_cache is None:
+            return super()._visit_module(module_name, module_path, parent)
+        code = module_path.read_bytes()
+        module = self.modules_cache.get(module_name, module_path, code)
+        if module is None:
+            module = super()._visit_module(module_name, module_path, parent)
+            self.modules_cache.set(module, module_path, code)
+            return module
+        return self._attach(module, module_path, code.decode("utf8").splitlines(keepends=False), parent)
+
+    def refresh(self, package: str) -> list[str]:
+        """Reload the modules of a package whose files changed since they were loaded.
+
+        Only the changed modules are visited again.
+        They replace the previous ones in the modules collection, keeping their submodules,
+        and the aliases pointing into the previous ones are reset,
+        so that they get resolved again when accessed.
+        Deleted modules are removed, and new modules are loaded
+        (on demand in partially loaded packages).
+
+        Parameters:
+            package: The package name.
+
+        Returns:
+            The paths of the reloaded, removed or added modules.
+        """
+        if self.tracker is None or package not in self.modules_collection.members:
+            return []
+        refreshed = []
+        for module_path, filepath in self.tracker.changes(package):
+            if self._reload_module(module_path, filepath):
+                refreshed.append(module_path)
+        refreshed.extend(self._load_new_submodules(package))
+        if refreshed:
+            _drop_inheritance_caches(self.modules_collection)
+        return refreshed
+
+    def _find_module(self, module_path: str) -> Module | None:
+        # Walk members directly, to avoid triggering on-demand loading.
+        obj: Any = self.modules_collection
+        for part in module_path.split("."):
+            obj = obj.members.get(part)
+            if obj is None or obj.is_alias or not obj.is_module:
+                return None
+        return obj
+
+    def _reload_module(self, module_path: str, filepath: Path) -> bool:
+        old = self._find_module(module_path)
+        self.tracker.files.pop(filepath, None)  # type: ignore[union-attr]
+        if old is None or old.filepath != filepath:
+            # Merged stubs and namespace packages are not reloaded individually.
+            return False
+        container: Any = old.parent or self.modules_collection
+        if not filepath.exists():
+            logger.debug(f"Removing module {module_path} ({filepath})")
+            _unlink_module(old)
+            container.del_member(old.name)
+            return True
+
+        logger.debug(f"Reloading module {module_path} ({filepath})")
+        try:
+            new = self._load_module(old.name, filepath, submodules=False, parent=old.parent)
+        except LoadingError as error:
+            logger.warning(f"Could not reload module {module_path}: {error}")
+            return False
+        for name, member in old.members.items():
+            if not member.is_alias and member.is_module:
+                new.set_member(name, member)
+        _unlink_aliases(old)
+        # Aliases pointing to the module itself are retargeted by `set_member`.
+        container.set_member(old.name, new)
+        self.expand_exports(new)
+        self.expand_wildcards(new, external=False)
+        return True
+
+    def _load_new_submodules(self, package: str) -> list[str]:
+        root = self.modules_collection.members[package]
+        if root.is_alias or not root.is_package:
+            return []
+        if package in self._submodules:
+            # Partially loaded package: new modules are loaded on demand.
+            self._submodules.pop(package)
+            return []
+        new_modules = []
+        for subparts, subpath in self.finder.submodules(root):
+            if subpath in self.tracker.files or self._find_module(".".join((package, *subparts))):  # type: ignore[union-attr]
+                continue
+            self._load_submodule(root, subparts, subpath)
+            if module := self._find_module(".".join((package, *subparts))):
+                logger.debug(f"Loaded new module {module.path} ({subpath})")
+                new_modules.append(module)
+        for module in new_modules:
+            self.expand_exports(module)
+            self.expand_wildcards(module, external=False)
+        return [module.path for module in new_modules]
+
+
+class LazyModulesCollection(ModulesCollection):
+    """A modules collection able to load missing modules on demand.
+
+    Packages registered with a loader are only partially loaded.
+    Whenever an object cannot be found in such a package,
+    the modules leading to it are loaded and the lookup is retried.
+    This also applies to alias resolution, which looks up targets in this collection.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the collection."""
+        super().__init__()
+        self.loaders: dict[str, PythonLoader] = {}
+        """The loaders used to load missing modules, by package name."""
+        self.reloaders: dict[str, Callable[[str], Any]] = {}
+        """Functions reloading evicted packages when an object is looked up in them, by package name."""
+        self.footprints: dict[str, int] = {}
+        """The estimated memory used by measured packages, in bytes, from the least to the most recently used."""
+        self._loading: set[str] = set()
+
+    @property
+    def footprint(self) -> int:
+        """The estimated memory used by measured packages, in bytes."""
+        return sum(self.footprints.values())
+
+    def _load_missing(self, key: str | Sequence[str]) -> bool:
+        path = key if isinstance(key, str) else ".".join(key)
+        package = path.split(".", 1)[0]
+        if path in self._loading or (package not in self.loaders and package not in self.reloaders):
+            return False
+        self._loading.add(path)
+        try:
+            reloaded = False
+            if (reload := self.reloaders.pop(package, None)) is not None:
+                logger.debug(f"Reloading evicted package {package}")
+                reload(path)
+                reloaded = package in self.members
+            if (loader := self.loaders.get(package)) is None:
+                return reloaded
+            new_modules = loader.load_module_chain(path)
+            if new_modules and package in self.footprints:
+                self.footprints[package] += sum(
+                    estimate_footprint(module, loader.lines_collection, submodules=False) for module in new_modules
+                )
+            return reloaded or bool(new_modules)
+        finally:
+            self._loading.discard(path)
+
+    def __getitem__(self, key: str | Sequence[str]) -> Any:
+        """Get a member with its name or path, loading missing modules on demand.
+
+        Parameters:
+            key: The name or path of the member.
+        """
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            if not self._load_missing(key):
+                raise
+        return super().__getitem__(key)
+
+    def get_member(self, key: str | Sequence[str]) -> Any:
+        """Get a member with its name or path, loading missing modules on demand.
+
+        Parameters:
+            key: The name or path of the member.
+        """
+        try:
+            return super().get_member(key)
+        except KeyError:
+            if not self._load_missing(key):
+                raise
+        return super().get_member(key)
+
+    def unload(self, package: str, lines_collection: LinesCollection | None = None) -> None:
+        """Remove a package from the collection.
+
+        Aliases pointing into the package are reset,
+        so that they get resolved again when accessed.
+
+        Parameters:
+            package: The package name.
+            lines_collection: The collection holding source lines, if the package's lines should be removed too.
+        """
+        module = self.members.pop(package, None)
+        if module is not None and not module.is_alias:
+            if lines_collection is not None:
+                for filepath in _module_files(module):
+                    lines_collection._data.pop(filepath, None)
+            _unlink_module(module)
+        self.loaders.pop(package, None)
+        self.footprints.pop(package, None)
+
+    def measure(self, package: str, lines_collection: LinesCollection | None = None) -> int:
+        """Estimate the memory used by a package, and mark it as the most recently used one.
+
+        Parameters:
+            package: The package name.
+            lines_collection: The collection holding source lines, if they should be counted.
+
+        Returns:
+            An estimate of the used memory, in bytes.
+        """
+        module = self.members.get(package)
+        size = 0 if module is None or module.is_alias else estimate_footprint(module, lines_collection)
+        self.footprints.pop(package, None)
+        self.footprints[package] = size
+        return size
+
+    def touch(self, package: str) -> None:
+        """Mark a measured package as the most recently used one.
+
+        Parameters:
+            package: The package name.
+        """
+        if (size := self.footprints.pop(package, None)) is not None:
+            self.footprints[package] = size
+
+    def evict(self, budget: int, lines_collection: LinesCollection | None = None, *, keep: str = "") -> list[str]:
+        """Unload the least recently used packages until the measured packages fit in the given memory budget.
+
+        Parameters:
+            budget: The memory budget, in bytes.
+            lines_collection: The collection holding source lines, to remove the lines of unloaded packages.
+            keep: The name of a package to keep in any case, for example the one in use.
+
+        Returns:
+            The names of the unloaded packages.
+        """
+        evicted = []
+        footprint = self.footprint
+        for package, size in list(self.footprints.items()):
+            if footprint <= budget:
+                break
+            if package == keep:
+                continue
+            self.unload(package, lines_collection)
+            footprint -= size
+            evicted.append(package)
+        if evicted:
+            # Classes of other packages must not keep their bases or inherited members from unloaded packages.
+            _drop_inheritance_caches(self)
+        return evicted
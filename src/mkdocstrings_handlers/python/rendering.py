@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import enum
-import random
 import re
 import string
 import sys
 import warnings
-from functools import lru_cache
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, lru_cache
+from html import unescape
 from pathlib import Path
 from re import Match, Pattern
-from typing import TYPE_CHECKING, Any, Callable, ClassVar
+from typing import TYPE_CHECKING, Any, Callable
+from weakref import WeakKeyDictionary, ref
 
 from griffe import (
     Alias,
@@ -26,18 +30,27 @@ from griffe import (
     Object,
 )
 from jinja2 import TemplateNotFound, pass_context, pass_environment
-from markupsafe import Markup
+from markupsafe import Markup, escape
 from mkdocs_autorefs.references import AutorefsHookInterface
 from mkdocstrings.loggers import get_logger
 
+from mkdocstrings_handlers.python.caching import MemoryCache
+from mkdocstrings_handlers.python.formatting import get_formatter, wrap_code
+from mkdocstrings_handlers.python.highlighting import highlight
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Mapping, Sequence
+    from concurrent.futures import Executor
 
-    from griffe import Attribute, Class, Function, Module
+    from griffe import Attribute, Class, Expr, ExprName, Function, Module
     from jinja2 import Environment, Template
     from jinja2.runtime import Context
     from mkdocstrings.handlers.base import CollectorItem
 
+    from mkdocstrings_handlers.python.formatting import Formatter
+
+    _ExpressionPart = str | tuple[str, str, int, bool]
+
 logger = get_logger(__name__)
 
 
@@ -70,12 +83,14 @@ order_map = {
 }
 
 
-def do_format_code(code: str, line_length: int) -> str:
+def do_format_code(code: str, line_length: int, formatter: str = "black") -> str:
     """Format code using Black.
 
     Parameters:
         code: The code to format.
         line_length: The line length to give to Black.
+        formatter: The formatter to use: `black`, `ruff`, `native`,
+            or the name of another [registered backend][mkdocstrings_handlers.python.formatting.formatters].
 
     Returns:
         The same code, formatted.
@@ -83,44 +98,217 @@ def do_format_code(code: str, line_length: int) -> str:
     code = code.strip()
     if len(code) < line_length:
         return code
-    formatter = _get_black_formatter()
-    return formatter(code, line_length)
+    if formatter == "native":
+        return wrap_code(code, line_length)
+    return _get_formatter(formatter)(code, line_length)
 
 
-class _StashCrossRefFilter:
-    stash: ClassVar[dict[str, str]] = {}
+class _DeferredFormatting:
+    # Signatures and attributes whose formatting is deferred until the end of a render.
+    # Code to format with a formatter backend is collected, to be formatted in batches,
+    # and each signature or attribute is replaced by a placeholder until then.
 
-    @staticmethod
-    def _gen_key(length: int) -> str:
-        return "_" + "".join(random.choice(string.ascii_letters + string.digits) for _ in range(max(1, length - 1)))  # noqa: S311
+    def __init__(self) -> None:
+        self.codes: list[tuple[str, int, str]] = []
+        self.finalizers: list[Callable[[], str]] = []
+        self.results: list[str] | None = None
 
-    def _gen_stash_key(self, length: int) -> str:
-        key = self._gen_key(length)
-        while key in self.stash:
-            key = self._gen_key(length)
-        return key
+    def defer(self, code: str | None, line_length: int, formatter: str, finalize: Callable[[], str]) -> str:
+        if code is not None and formatter != "native":
+            self.codes.append((code, line_length, formatter))
+        self.finalizers.append(finalize)
+        return f"{_DEFERRED_PREFIX}{len(self.finalizers) - 1}{_DEFERRED_SUFFIX}"
+
+    def apply(self, html: str, executor: Executor | None = None) -> str:
+        """Format all deferred code and replace placeholders in the given HTML.
+
+        Parameters:
+            html: The rendered HTML.
+            executor: An optional pool in which to format code.
+
+        Returns:
+            The final HTML.
+        """
+        self.finalize(executor)
+        return self.replace(html)
+
+    def finalize(self, executor: Executor | None = None) -> None:
+        # Format all deferred code, once the whole object is rendered.
+        if self.results is None:
+            _format_codes(self.codes, executor)
+            self.results = [finalize() for finalize in self.finalizers]
+
+    def replace(self, html: str) -> str:
+        # Replace placeholders in (a part of) the rendered HTML, once finalized.
+        if not self.results:
+            return html
+        results = self.results
+        return _DEFERRED_RE.sub(lambda match: results[int(match.group(1))], html)
+
+
+_DEFERRED_PREFIX = "mkdocstrings-python-deferred-"
+_DEFERRED_SUFFIX = "-end"
+_DEFERRED_RE = re.compile(rf"{_DEFERRED_PREFIX}(\d+){_DEFERRED_SUFFIX}")
+_deferred_formatting: ContextVar[_DeferredFormatting | None] = ContextVar("deferred_formatting", default=None)
+
+
+@contextmanager
+def deferred_formatting() -> Iterator[_DeferredFormatting]:
+    """Defer the formatting of signatures and attributes rendered within this context.
+
+    Signatures and attributes are rendered as placeholders.
+    Once rendering is done, call `apply(html, executor)` on the yielded object
+    to format all the collected code in batches, one per formatter backend
+    (Black can use the given pool of processes), and replace placeholders with the formatted, highlighted code.
+
+    Yields:
+        An object collecting the deferred signatures and attributes.
+    """
+    deferred = _DeferredFormatting()
+    token = _deferred_formatting.set(deferred)
+    try:
+        yield deferred
+    finally:
+        _deferred_formatting.reset(token)
+
+
+def render_template(
+    template: Template,
+    context: Mapping[str, Any],
+    executor: Executor | None = None,
+    *,
+    defer_formatting: bool = False,
+    formatted_code_cache: MemoryCache | None = None,
+) -> str:
+    """Render a template, optionally deferring the formatting of signatures and attributes.
 
-    def __call__(self, crossref: str, *, length: int) -> str:
-        key = self._gen_stash_key(length)
-        self.stash[key] = crossref
+    When formatting is deferred (see [`deferred_formatting`][mkdocstrings_handlers.python.rendering.deferred_formatting]),
+    the strings generated by the template are kept apart until code is formatted in batches,
+    then placeholders are replaced in the strings containing them, before the strings are joined.
+    The output is therefore assembled once, instead of being copied again to replace placeholders.
+
+    Parameters:
+        template: The template to render.
+        context: The template context.
+        executor: An optional pool in which to format deferred code.
+        defer_formatting: Whether to defer the formatting of signatures and attributes.
+        formatted_code_cache: The cache in which to store formatted code, instead of a cache for this render only.
+
+    Returns:
+        The rendered HTML.
+    """
+    with caching_formatted_code(MemoryCache() if formatted_code_cache is None else formatted_code_cache):
+        if not defer_formatting:
+            return template.render(context)
+        with deferred_formatting() as deferred:
+            chunks = []
+            placeholders = []
+            # Placeholders are generated whole by filters, so they never span two strings.
+            for index, chunk in enumerate(template.generate(context)):
+                chunks.append(chunk)
+                if _DEFERRED_PREFIX in chunk:
+                    placeholders.append(index)
+        deferred.finalize(executor)
+    for index in placeholders:
+        chunks[index] = deferred.replace(chunks[index])
+    return "".join(chunks)
+
+
+_STASH_KEY_ALPHABET = string.digits + string.ascii_letters
+_STASH_KEY_RE = re.compile(r"\b_\w*\b")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+class _CrossRefStash:
+    # Cross-references stashed while rendering a single signature or attribute,
+    # replaced by keys of the same length so that formatting code is not affected.
+
+    def __init__(self) -> None:
+        self.crossrefs: dict[str, str] = {}
+        self._keys: dict[str, str] = {}
+
+    def stash(self, crossref: str, length: int) -> str:
+        # Keys are the base-62 index of the cross-reference, padded with underscores:
+        # they are valid identifiers, unique within the stash, and the same from one build to another.
+        # Keys are never longer than the text they replace (or two characters, for single-character texts).
+        # Once all keys of that length are taken, the text is not stashed and the cross-reference is lost.
+        if (key := self._keys.get(crossref)) is not None:
+            return key
+        index = len(self.crossrefs)
+        digits = ""
+        while True:
+            index, digit = divmod(index, len(_STASH_KEY_ALPHABET))
+            digits = _STASH_KEY_ALPHABET[digit] + digits
+            if not index:
+                break
+        key = "_" + digits.rjust(max(1, length - 1), "_")
+        if len(key) > max(length, 2):
+            return unescape(_TAG_RE.sub("", crossref))
+        self.crossrefs[key] = crossref
+        self._keys[crossref] = key
         return key
 
+    def unstash(self, code: str) -> str:
+        if not self.crossrefs:
+            return code
+        return _STASH_KEY_RE.sub(lambda match: self.crossrefs.get(match.group(0), match.group(0)), code)
+
 
-do_stash_crossref = _StashCrossRefFilter()
+_crossref_stash: ContextVar[_CrossRefStash | None] = ContextVar("crossref_stash", default=None)
 
 
-def _format_signature(name: Markup, signature: str, line_length: int) -> str:
-    name = str(name).strip()  # type: ignore[assignment]
+@contextmanager
+def _stashing_crossrefs() -> Iterator[_CrossRefStash]:
+    stash = _CrossRefStash()
+    token = _crossref_stash.set(stash)
+    try:
+        yield stash
+    finally:
+        _crossref_stash.reset(token)
+
+
+def do_stash_crossref(crossref: str, *, length: int) -> str:
+    """Stash a cross-reference rendered in a signature or attribute, replacing it with a key.
+
+    Keys have the given length (at least two characters), so that formatting the code is not affected,
+    and are replaced back with the cross-references once the code is formatted and highlighted.
+    The same cross-reference is always replaced with the same key.
+
+    Parameters:
+        crossref: The rendered cross-reference.
+        length: The length of the cross-reference text.
+
+    Returns:
+        The key, the text of the cross-reference when all keys of the given length are taken,
+            or the cross-reference itself when not rendering a signature or attribute.
+    """
+    if (stash := _crossref_stash.get()) is None:
+        return crossref
+    return stash.stash(crossref, length)
+
+
+def _signature_code(name: str, signature: str, line_length: int) -> str | None:
+    # Return the code given to Black to format a signature, if it is too long.
+    name = name.strip()
     signature = signature.strip()
     if len(name + signature) < line_length:
-        return name + signature
-
+        return None
     # Black cannot format names with dots, so we replace
     # the whole name with a string of equal length
+    return f"def {'x' * len(name)}{signature}: pass"
+
+
+def _format_signature(name: Markup, signature: str, line_length: int, formatter: str = "black") -> str:
+    name = str(name).strip()  # type: ignore[assignment]
+    signature = signature.strip()
+    formatable = _signature_code(name, signature, line_length)
+    if formatable is None:
+        return name + signature
+    if formatter == "native":
+        return wrap_code(name + signature, line_length, first_bracket=True)
+
     name_length = len(name)
-    formatter = _get_black_formatter()
-    formatable = f"def {'x' * name_length}{signature}: pass"
-    formatted = formatter(formatable, line_length)
+    formatted = _get_formatter(formatter)(formatable, line_length)
 
     # We put back the original name
     # and remove starting `def ` and trailing `: pass`
@@ -161,8 +349,49 @@ def do_format_signature(
         new_context["config"] = dict(new_context["config"])
         new_context["config"]["show_signature_annotations"] = annotations
 
-    signature = template.render(new_context, function=function, signature=True)
-    signature = _format_signature(callable_path, signature, line_length)
+    with _stashing_crossrefs() as stash:
+        signature = template.render(new_context, function=function, signature=True)
+    formatter = context.parent["config"].get("signature_formatter", "black")
+    highlighter = context.parent["config"].get("signature_highlighter", "pygments")
+    if (deferred := _deferred_formatting.get()) is not None:
+        return deferred.defer(
+            _signature_code(str(callable_path), signature, line_length),
+            line_length,
+            formatter,
+            lambda: _highlight_signature(
+                env,
+                callable_path,
+                signature,
+                line_length,
+                stash,
+                formatter=formatter,
+                highlighter=highlighter,
+            ),
+        )
+    return _highlight_signature(
+        env,
+        callable_path,
+        signature,
+        line_length,
+        stash,
+        formatter=formatter,
+        highlighter=highlighter,
+    )
+
+
+def _highlight_signature(
+    env: Environment,
+    callable_path: Markup,
+    signature: str,
+    line_length: int,
+    stash: _CrossRefStash,
+    *,
+    formatter: str,
+    highlighter: str,
+) -> str:
+    signature = _format_signature(callable_path, signature, line_length, formatter)
+    if highlighter == "native" and (html := _highlight_natively(env, signature, stash, function=True)) is not None:
+        return html
     signature = str(
         env.filters["highlight"](
             Markup.escape(signature),
@@ -181,12 +410,7 @@ def do_format_signature(
     if signature.find('class="nf"') == -1:
         signature = signature.replace('class="n"', 'class="nf"', 1)
 
-    if stash := env.filters["stash_crossref"].stash:
-        for key, value in stash.items():
-            signature = re.sub(rf"\b{key}\b", value, signature)
-        stash.clear()
-
-    return signature
+    return stash.unstash(signature)
 
 
 @pass_context
@@ -211,19 +435,58 @@ def do_format_attribute(
         The same code, formatted.
     """
     env = context.environment
-    # TODO: Stop using `do_get_template` when `*.html` templates are removed.
-    template = env.get_template(do_get_template(env, "expression"))
-    annotations = context.parent["config"]["show_signature_annotations"]
+    config = context.parent["config"]
+    if _is_our_template(env, "expression"):
+
+        def render(expression: str | Expr) -> str:
+            return _render_expression(expression, config, signature=True)
+
+    else:
+        # TODO: Stop using `do_get_template` when `*.html` templates are removed.
+        template = env.get_template(do_get_template(env, "expression"))
+
+        def render(expression: str | Expr) -> str:
+            return template.render(context.parent, expression=expression, signature=True)
 
     signature = str(attribute_path).strip()
-    if annotations and attribute.annotation:
-        annotation = template.render(context.parent, expression=attribute.annotation, signature=True)
-        signature += f": {annotation}"
-    if attribute.value:
-        value = template.render(context.parent, expression=attribute.value, signature=True)
-        signature += f" = {value}"
-
-    signature = do_format_code(signature, line_length)
+    with _stashing_crossrefs() as stash:
+        if config["show_signature_annotations"] and attribute.annotation:
+            signature += f": {render(attribute.annotation)}"
+        if attribute.value:
+            signature += f" = {render(attribute.value)}"
+
+    formatter = config.get("signature_formatter", "black")
+    highlighter = config.get("signature_highlighter", "pygments")
+    if (deferred := _deferred_formatting.get()) is not None:
+        code = signature.strip()
+        return deferred.defer(
+            code if len(code) >= line_length else None,
+            line_length,
+            formatter,
+            lambda: _highlight_attribute(
+                env,
+                signature,
+                line_length,
+                stash,
+                formatter=formatter,
+                highlighter=highlighter,
+            ),
+        )
+    return _highlight_attribute(env, signature, line_length, stash, formatter=formatter, highlighter=highlighter)
+
+
+def _highlight_attribute(
+    env: Environment,
+    signature: str,
+    line_length: int,
+    stash: _CrossRefStash,
+    *,
+    formatter: str,
+    highlighter: str,
+) -> str:
+    signature = do_format_code(signature, line_length, formatter)
+    if highlighter == "native" and (html := _highlight_natively(env, signature, stash)) is not None:
+        return html
     signature = str(
         env.filters["highlight"](
             Markup.escape(signature),
@@ -232,13 +495,36 @@ def do_format_attribute(
             classes=["doc-signature"],
         ),
     )
+    return stash.unstash(signature)
+
 
-    if stash := env.filters["stash_crossref"].stash:
-        for key, value in stash.items():
-            signature = re.sub(rf"\b{key}\b", value, signature)
-        stash.clear()
+# Markup wrapping code highlighted by the `highlight` filter, by environment:
+# the filter, and the markup before and after the code (none if the filter does not use Pygments).
+_highlight_wrappers: WeakKeyDictionary[Environment, tuple[Callable, tuple[str, str] | None]] = WeakKeyDictionary()
+_HIGHLIGHT_PROBE = '<span class="n">x</span>'
 
-    return signature
+
+def _highlight_wrapper(env: Environment) -> tuple[str, str] | None:
+    highlight_filter = env.filters["highlight"]
+    cached = _highlight_wrappers.get(env)
+    if cached is not None and cached[0] == highlight_filter:
+        return cached[1]
+    html = str(highlight_filter("x", language="python", inline=False, classes=["doc-signature"]))
+    before, probe, after = html.partition(_HIGHLIGHT_PROBE)
+    wrapper = (before, after) if probe and _HIGHLIGHT_PROBE not in after else None
+    _highlight_wrappers[env] = (highlight_filter, wrapper)
+    return wrapper
+
+
+def _highlight_natively(env: Environment, code: str, stash: _CrossRefStash, *, function: bool = False) -> str | None:
+    # Highlight code without Pygments, inserting cross-references directly,
+    # unless the code contains unsupported syntax or the `highlight` filter does not use Pygments.
+    if (wrapper := _highlight_wrapper(env)) is None:
+        return None
+    # Like Pygments' lexers, we strip leading and trailing newlines.
+    if (html := highlight(code.strip("\n"), stash.crossrefs, function=function)) is None:
+        return None
+    return wrapper[0] + html + wrapper[1]
 
 
 def do_order_members(
@@ -354,18 +640,186 @@ def do_split_path(path: str, full_path: str) -> list[tuple[str, str]]:
     return pairs
 
 
-def _keep_object(name: str, filters: Sequence[tuple[Pattern, bool]]) -> bool:
-    keep = None
-    rules = set()
-    for regex, exclude in filters:
-        rules.add(exclude)
-        if regex.search(name):
-            keep = not exclude
-    if keep is None:
+# A compiled expression is a sequence of parts: either (escaped) text,
+# or cross-references as a tuple (autoref element, escaped title, title length, is name),
+# that are rendered (or stashed) depending on the configuration when the expression is rendered.
+_ANNOTATED_PATHS = frozenset(("typing.Annotated", "typing_extensions.Annotated"))
+
+# Compiled expressions by identity, along with a weak reference to the expression
+# that removes its entry once the expression is garbage collected.
+_compiled_expressions: dict[int, tuple[ref, dict[tuple[str, bool, bool], tuple[_ExpressionPart, ...]]]] = {}
+
+
+def _compile_crossref(parts: list, name: ExprName, annotations_path: str) -> None:
+    # Same as the `crossref` macro of the `expression` template.
+    full = name.canonical_path
+    if annotations_path == "brief":
+        annotation = name.canonical_name
+    elif annotations_path == "source":
+        annotation = name.name
+    else:
+        annotation = full
+    for index, (title, path) in enumerate(do_split_path(annotation, full)):
+        if index:
+            parts.append(".")
+        hover = " hover" if title != path else ""
+        escaped_title = str(escape(title))
+        autoref = f'<autoref identifier="{escape(path)}" optional{hover}>{escaped_title}</autoref>'
+        parts.append((autoref, escaped_title, len(title), True))
+
+
+def _compile_expression(
+    parts: list,
+    expression: str | Expr,
+    annotations_path: str,
+    *,
+    signature: bool,
+    unwrap_annotated: bool,
+) -> None:
+    # Same as the `render` macro of the `expression` template.
+    if isinstance(expression, str):
+        parts.append(expression if signature else str(escape(expression)))
+        return
+    options = {"signature": signature, "unwrap_annotated": unwrap_annotated}
+    classname = expression.classname
+    if classname == "ExprName":
+        _compile_crossref(parts, expression, annotations_path)  # type: ignore[arg-type]
+    elif unwrap_annotated and classname == "ExprSubscript" and expression.canonical_path in _ANNOTATED_PATHS:
+        _compile_expression(parts, expression.slice.elements[0], annotations_path, **options)  # type: ignore[attr-defined]
+    elif classname == "ExprAttribute":
+        if annotations_path == "brief":
+            if expression.last.is_enum_value:  # type: ignore[attr-defined]
+                _compile_crossref(parts, expression.last.parent, "brief")  # type: ignore[attr-defined]
+                parts.append(".value")
+            else:
+                _compile_expression(parts, expression.last, "brief", **options)  # type: ignore[attr-defined]
+        elif annotations_path == "full":
+            _compile_expression(parts, expression.first, "full", **options)  # type: ignore[attr-defined]
+            for element in list(expression)[1:]:
+                _compile_expression(parts, element, "brief", **options)
+        else:
+            for element in expression:
+                _compile_expression(parts, element, annotations_path, **options)
+    elif classname == "ExprKeyword":
+        # Same as the `param_crossref` macro of the `expression` template.
+        name = str(escape(expression.name))  # type: ignore[attr-defined]
+        autoref = f'<autoref identifier="{escape(expression.canonical_path)}" optional hover>{name}</autoref>'
+        parts.append((autoref, name, len(expression.name), False))  # type: ignore[attr-defined]
+        parts.append("=")
+        _compile_expression(parts, expression.value, annotations_path, **options)  # type: ignore[attr-defined]
+    else:
+        for element in expression:
+            _compile_expression(parts, element, annotations_path, **options)
+
+
+def _compiled_expression(
+    expression: Expr,
+    annotations_path: str,
+    *,
+    signature: bool,
+    unwrap_annotated: bool,
+) -> tuple[_ExpressionPart, ...]:
+    key = id(expression)
+    entry = _compiled_expressions.get(key)
+    if entry is None or entry[0]() is not expression:
+        entry = _compiled_expressions[key] = (ref(expression, lambda _: _compiled_expressions.pop(key, None)), {})
+    options = (annotations_path, signature, unwrap_annotated)
+    if (compiled := entry[1].get(options)) is None:
+        parts: list[_ExpressionPart] = []
+        _compile_expression(parts, expression, annotations_path, signature=signature, unwrap_annotated=unwrap_annotated)
+        compiled = entry[1][options] = tuple(parts)
+    return compiled
+
+
+@pass_context
+def do_render_expression(context: Context, expression: str | Expr, annotations_path: str | None = None) -> Markup:
+    """Render an expression, with cross-references.
+
+    This filter produces the same HTML as the `expression` template,
+    without the overhead of recursive macro calls. Expressions are compiled
+    once per configuration, and only their cross-references are rendered again.
+    When the `expression` template is overridden, it is rendered instead.
+
+    Parameters:
+        context: Jinja context, passed automatically.
+        expression: The expression to render.
+        annotations_path: Either "brief", "source", or "full". Default: the `annotations_path` configuration option.
+
+    Returns:
+        The rendered expression.
+    """
+    env = context.environment
+    if not _is_our_template(env, "expression"):
+        # TODO: Stop using `do_get_template` when `*.html` templates are removed.
+        template = env.get_template(do_get_template(env, "expression"))
+        return Markup(template.render(context.get_all(), expression=expression))  # noqa: S704
+    return Markup(  # noqa: S704
+        _render_expression(
+            expression,
+            context["config"],
+            annotations_path,
+            signature=bool(context.get("signature")),
+        ),
+    )
+
+
+def _render_expression(
+    expression: str | Expr,
+    config: Mapping[str, Any],
+    annotations_path: str | None = None,
+    *,
+    signature: bool,
+) -> str:
+    if isinstance(expression, str):
+        return expression if signature else str(escape(expression))
+    compiled = _compiled_expression(
+        expression,
+        annotations_path or config["annotations_path"],
+        signature=signature,
+        unwrap_annotated=config["unwrap_annotated"],
+    )
+    crossrefs = config["signature_crossrefs"]
+    html = []
+    for part in compiled:
+        if isinstance(part, str):
+            html.append(part)
+            continue
+        autoref, title, length, is_name = part
+        if signature:
+            html.append(do_stash_crossref(autoref, length=length) if crossrefs else title)
+        else:
+            html.append(autoref if is_name or crossrefs else title)
+    return "".join(html)
+
+
+class _MembersFilter:
+    # Filters compiled into a single decision procedure, memoized per name.
+    # The last matching filter decides, so we try them in reverse order.
+
+    def __init__(self, filters: tuple[tuple[Pattern, bool], ...]) -> None:
+        self._filters = filters[::-1]
         # When we only include stuff, no match = reject.
         # When we only exclude stuff, or include and exclude stuff, no match = keep.
-        return rules != {False}
-    return keep
+        self._default = not filters or any(exclude for _, exclude in filters)
+        self._decisions: dict[str, bool] = {}
+
+    def __call__(self, name: str) -> bool:
+        try:
+            return self._decisions[name]
+        except KeyError:
+            pass
+        keep = self._default
+        for regex, exclude in self._filters:
+            if regex.search(name):
+                keep = not exclude
+                break
+        self._decisions[name] = keep
+        return keep
+
+
+@lru_cache(maxsize=128)
+def _compile_filters(filters: tuple[tuple[Pattern, bool], ...]) -> _MembersFilter:
+    return _MembersFilter(filters)
 
 
 def do_filter_objects(
@@ -422,37 +876,131 @@ def do_filter_objects(
 
     # Use filters and docstrings.
     if filters:
-        objects = [
-            obj for obj in objects if _keep_object(obj.name, filters) or (inherited_members_specified and obj.inherited)
-        ]
+        keep = _compile_filters(tuple(filters))
+        objects = [obj for obj in objects if keep(obj.name) or (inherited_members_specified and obj.inherited)]
     if keep_no_docstrings:
         return objects
 
     return [obj for obj in objects if obj.has_docstrings or (inherited_members_specified and obj.inherited)]
 
 
-@lru_cache(maxsize=1)
-def _get_black_formatter() -> Callable[[str, int], str]:
+# Formatted code, keyed by formatter name and version, line length and code.
+# Each handler has its own cache, persisted across builds when a cache directory is configured.
+_formatted_code_cache: ContextVar[MemoryCache | None] = ContextVar("formatted_code_cache", default=None)
+
+
+@contextmanager
+def caching_formatted_code(cache: MemoryCache) -> Iterator[MemoryCache]:
+    """Cache the code formatted within this context in the given cache.
+
+    Outside of such a context, formatted code is not cached.
+
+    Parameters:
+        cache: The cache in which to store formatted code.
+
+    Yields:
+        The given cache.
+    """
+    token = _formatted_code_cache.set(cache)
     try:
-        from black import InvalidInput, Mode, format_str
-    except ModuleNotFoundError:
-        logger.info("Formatting signatures requires Black to be installed.")
+        yield cache
+    finally:
+        _formatted_code_cache.reset(token)
+
+
+@cache
+def _get_formatter(name: str = "black") -> Callable[[str, int], str]:
+    backend = get_formatter(name)
+    if (version := backend.version) is None:
         return lambda text, _: text
 
     def formatter(code: str, line_length: int) -> str:
-        mode = Mode(line_length=line_length)
-        try:
-            return format_str(code, mode=mode)
-        except InvalidInput:
-            return code
+        if (formatted_code_cache := _formatted_code_cache.get()) is None:
+            return backend.format(code, line_length)
+        key = (backend.name, version, line_length, code)
+        if (formatted := formatted_code_cache.get(key)) is not None:
+            return formatted
+        formatted = backend.format(code, line_length)
+        formatted_code_cache.set(key, formatted)
+        return formatted
 
     return formatter
 
 
+def _format_codes(codes: Sequence[tuple[str, int, str]], executor: Executor | None) -> None:
+    # Format code in batches, one per formatter backend,
+    # storing the results in the cache where the formatters will find them.
+    if (formatted_code_cache := _formatted_code_cache.get()) is None:
+        return
+    batches: dict[Formatter, dict[tuple, tuple[str, int]]] = defaultdict(dict)
+    for code, line_length, name in codes:
+        backend = get_formatter(name)
+        if backend.version is None:
+            continue
+        key = (backend.name, backend.version, line_length, code)
+        if key not in formatted_code_cache.entries:
+            batches[backend][key] = (code, line_length)
+    for backend, batch in batches.items():
+        if len(batch) < 2:  # noqa: PLR2004
+            continue
+        for key, formatted in zip(batch, backend.format_many(list(batch.values()), executor)):
+            formatted_code_cache.set(key, formatted)
+
+
+# Resolved template names, by environment: the environment's loader,
+# and for each object kind (or template name), the resolved name and template.
+_resolved_templates: WeakKeyDictionary[Environment, tuple[Any, dict[str, tuple[str, Template | None]]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _resolve_template(env: Environment, name: str) -> tuple[str, Template | None]:
+    try:
+        template = env.get_template(f"{name}.html")
+    except TemplateNotFound:
+        return f"{name}.html.jinja", None
+    our_template = Path(template.filename).is_relative_to(Path(__file__).parent)  # type: ignore[arg-type]
+    if our_template:
+        return f"{name}.html.jinja", template
+    # TODO: Switch to a warning log after some time.
+    logger.info(
+        f"DeprecationWarning: Overriding '{name}.html' is deprecated, override '{name}.html.jinja' instead. "
+        "After some time, this message will be logged as a warning, causing strict builds to fail.",
+        once=True,
+    )
+    return f"{name}.html", template
+
+
+# Whether templates are ours, and not overridden by users, by environment:
+# the environment's loader, and for each template name, the template and whether it is ours.
+_our_templates: WeakKeyDictionary[Environment, tuple[Any, dict[str, tuple[Template, bool]]]] = WeakKeyDictionary()
+
+
+def _is_our_template(env: Environment, name: str) -> bool:
+    # Whether the template used for the given name is one of ours, and not overridden.
+    loader, templates = _our_templates.get(env, (None, None))
+    if templates is None or loader is not env.loader:
+        templates = {}
+        _our_templates[env] = (env.loader, templates)
+    if name in templates:
+        template, ours = templates[name]
+        if not env.auto_reload or template.is_up_to_date:
+            return ours
+    # TODO: Stop using `do_get_template` when `*.html` templates are removed.
+    template = env.get_template(do_get_template(env, name))
+    ours = Path(template.filename).is_relative_to(Path(__file__).parent)  # type: ignore[arg-type]
+    templates[name] = (template, ours)
+    return ours
+
+
 @pass_environment
 def do_get_template(env: Environment, obj: str | Object) -> str | Template:
     """Get the template name used to render an object.
 
+    Template names are resolved once per environment and object kind.
+    They are resolved again when the environment's loader is replaced,
+    or, if the environment automatically reloads templates, when a template changed.
+
     Parameters:
         env: The Jinja environment, passed automatically.
         obj: A Griffe object, or a template name.
@@ -466,20 +1014,92 @@ def do_get_template(env: Environment, obj: str | Object) -> str | Template:
         if name := extra_data.get("template", ""):
             return name
         name = obj.kind.value
-    try:
-        template = env.get_template(f"{name}.html")
-    except TemplateNotFound:
-        return f"{name}.html.jinja"
-    our_template = Path(template.filename).is_relative_to(Path(__file__).parent)  # type: ignore[arg-type]
-    if our_template:
-        return f"{name}.html.jinja"
-    # TODO: Switch to a warning log after some time.
-    logger.info(
-        f"DeprecationWarning: Overriding '{name}.html' is deprecated, override '{name}.html.jinja' instead. "
-        "After some time, this message will be logged as a warning, causing strict builds to fail.",
-        once=True,
-    )
-    return f"{name}.html"
+
+    loader, resolved = _resolved_templates.get(env, (None, None))
+    if resolved is None or loader is not env.loader:
+        resolved = {}
+        _resolved_templates[env] = (env.loader, resolved)
+    if name in resolved:
+        template_name, template = resolved[name]
+        if not env.auto_reload or template is None or template.is_up_to_date:
+            return template_name
+    template_name, template = resolved[name] = _resolve_template(env, name)  # type: ignore[index]
+    return template_name
+
+
+# Names of the available templates, by environment, along with the environment's loader.
+_templates_index: WeakKeyDictionary[Environment, tuple[Any, frozenset[str]]] = WeakKeyDictionary()
+
+
+@pass_environment
+def do_existing_template(env: Environment, template_name: str) -> bool:
+    """Tell whether a template exists.
+
+    Template names are listed once per environment,
+    and listed again when the environment's loader is replaced.
+
+    Parameters:
+        env: The Jinja environment, passed automatically.
+        template_name: The template name.
+
+    Returns:
+        Whether the template exists.
+    """
+    loader, names = _templates_index.get(env, (None, None))
+    if names is None or loader is not env.loader:
+        names = frozenset(env.list_templates())
+        _templates_index[env] = (env.loader, names)
+    return template_name in names
+
+
+@pass_context
+def do_summarized_members(context: Context, obj: Object | Alias) -> list[Object | Alias]:
+    """Return the members of a module or class that are only summarized, because it has too many of them.
+
+    See the `split_members_threshold` option.
+
+    Parameters:
+        context: The template context, passed automatically.
+        obj: The module or class.
+
+    Returns:
+        The members that are only summarized, if any.
+    """
+    config = context["config"]
+    threshold = config.get("split_members_threshold")
+    if not threshold or not (obj.is_module or obj.is_class):
+        return []
+    # Same selection as the children template.
+    members_list = config["members"] if context.get("root_members") else None
+    members = [
+        member
+        for member in do_filter_objects(
+            obj.all_members,
+            filters=config["filters"],
+            members_list=members_list,
+            inherited_members=config["inherited_members"],
+            keep_no_docstrings=config["show_if_no_docstring"],
+        )
+        if members_list is not None or not member.is_imported or member.is_public
+    ]
+    return members if len(members) > threshold else []
+
+
+@pass_context
+def do_split_members(context: Context, obj: Object | Alias) -> bool:
+    """Tell whether a module or class has too many members to render them in place.
+
+    Such objects are rendered with summaries of their members instead,
+    see the `split_members_threshold` option.
+
+    Parameters:
+        context: The template context, passed automatically.
+        obj: The module or class.
+
+    Returns:
+        Whether the object's members are only summarized.
+    """
+    return bool(do_summarized_members(context, obj))
 
 
 @pass_context
@@ -2,19 +2,36 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from textwrap import dedent
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pytest
-from griffe import DocstringSectionExamples, DocstringSectionKind, temporary_visited_module
+from griffe import DocstringSectionExamples, DocstringSectionKind, Parser, temporary_visited_module
+from jinja2 import pass_context
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.pages import Page, _RelativePathTreeprocessor
+from mkdocstrings.handlers.rendering import Highlighter
 
+from mkdocstrings_handlers.python import docstrings
+from mkdocstrings_handlers.python import handler as handler_module
 from mkdocstrings_handlers.python.handler import CollectionError, PythonHandler, get_handler
+from mkdocstrings_handlers.python.loading import ModulesCache
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from griffe import DocstringSection
+    from jinja2.runtime import Context
+    from markdown import Markdown
+    from markupsafe import Markup
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocstrings.plugin import MkdocstringsPlugin
+
 
 def test_collect_missing_module() -> None:
     """Assert error is raised for missing modules."""
@@ -172,3 +189,782 @@ def test_rendering_object_source_without_lineno(handler: PythonHandler) -> None:
         module["Class.function"].lineno = None
         module["attribute"].lineno = None
         assert handler.render(module, {"show_source": True})
+
+
+def test_rendering_config_compiled_once(handler: PythonHandler) -> None:
+    """Assert render options are compiled once, without modifying the given options.
+
+    Parameters:
+        handler: A handler instance.
+    """
+    config = {"filters": ["!^_"], "members_order": "source", "summary": True}
+    with temporary_visited_module("def f(): ...\ndef _g(): ...") as module:
+        first = handler.render(module, config)
+        second = handler.render(module, dict(config))
+    assert first == second
+    assert config == {"filters": ["!^_"], "members_order": "source", "summary": True}
+    assert len(handler._compiled_configs) == 1
+
+
+def test_modules_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Assert unchanged modules are loaded from the persistent cache.
+
+    Parameters:
+        monkeypatch: Pytest fixture to record the modules caches used by the handler.
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    caches: list[ModulesCache] = []
+
+    class RecordedModulesCache(ModulesCache):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            caches.append(self)
+
+    monkeypatch.setattr(handler_module, "ModulesCache", RecordedModulesCache)
+    package = tmp_path / "src" / "cached_package"
+    package.mkdir(parents=True)
+    package.joinpath("__init__.py").write_text('"""Package docstring."""\n\nfrom cached_package.mod import f\n')
+    package.joinpath("mod.py").write_text('def f():\n    """Function docstring."""\n')
+    cache_dir = tmp_path / "cache"
+
+    handler = get_handler(theme="material", paths=[str(tmp_path / "src")], cache_dir=str(cache_dir))
+    assert handler.collect("cached_package.f", {}).docstring.value == "Function docstring."  # type: ignore[union-attr]
+    handler.teardown()
+    assert (caches[-1].hits, caches[-1].misses) == (0, 2)
+    assert len(list(cache_dir.joinpath("modules").rglob("*.pickle"))) == 2
+
+    package.joinpath("mod.py").write_text('def f():\n    """Changed docstring."""\n')
+    handler = get_handler(theme="material", paths=[str(tmp_path / "src")], cache_dir=str(cache_dir))
+    loaded = handler.collect("cached_package", {})
+    assert (caches[-1].hits, caches[-1].misses) == (1, 1)
+    assert loaded.docstring.value == "Package docstring."  # type: ignore[union-attr]
+    assert loaded["f"].docstring.value == "Changed docstring."
+    assert loaded.lines  # Source lines are still available for cached modules.
+
+
+def test_modules_cache_extensions(tmp_path: Path) -> None:
+    """Assert cached modules are invalidated when the code of extensions changes.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    extension = tmp_path / "extension.py"
+    extension.write_text("from griffe import Extension\n\nclass MyExtension(Extension): ...\n")
+    extensions = [f"{extension}:MyExtension", "griffe_inherited_docstrings", "dataclasses"]
+    environment = ModulesCache(tmp_path, extensions=extensions)._environment
+    assert ModulesCache(tmp_path, extensions=extensions)._environment == environment
+    extension.write_text("from griffe import Extension\n\nclass MyExtension(Extension):\n    pass\n")
+    assert ModulesCache(tmp_path, extensions=extensions)._environment != environment
+
+
+def test_targeted_loading(tmp_path: Path) -> None:
+    """Assert only the modules leading to the requested objects are loaded.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    package = tmp_path / "targeted_package"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("from targeted_package.c import C\n\n__all__ = ['C']\n")
+    package.joinpath("a.py").write_text("def f(): ...\n")
+    package.joinpath("b.py").write_text("def g(): ...\n")
+    package.joinpath("c.py").write_text("class C: ...\n")
+    handler = get_handler(theme="material", paths=[str(tmp_path)])
+
+    assert handler.collect("targeted_package.a.f", {"targeted_loading": True})
+    module = handler._modules_collection["targeted_package"]
+    assert "a" in module.members
+    assert "b" not in module.members
+
+    assert handler.collect("targeted_package.b.g", {"targeted_loading": True})
+    assert "b" in module.members
+    assert handler.collect("targeted_package.C", {"targeted_loading": True}).target_path == "targeted_package.c.C"
+    assert not handler._modules_collection.footprints  # Packages are only measured with a memory budget.
+
+    handler = get_handler(theme="material", paths=[str(tmp_path)], modules_memory_budget=1024)
+    assert handler.collect("targeted_package.a.f", {"targeted_loading": True})
+    footprint = handler._modules_collection.footprints["targeted_package"]
+    assert handler.collect("targeted_package.b.g", {"targeted_loading": True})
+    assert handler._modules_collection.footprints["targeted_package"] > footprint
+
+
+def test_reloading_changed_modules(tmp_path: Path) -> None:
+    """Assert modules changed between builds are reloaded, and only them.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    package = tmp_path / "reloaded_package"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("from reloaded_package.base import Base, f\n")
+    package.joinpath("base.py").write_text('class Base:\n    def a(self): ...\n\ndef f():\n    """Old."""\n')
+    package.joinpath("child.py").write_text("from reloaded_package.base import Base\n\nclass Child(Base): ...\n")
+
+    handler = get_handler(theme="material", paths=[str(tmp_path)], keep_loaded_modules=True)
+    assert handler.collect("reloaded_package.f", {}).docstring.value == "Old."  # type: ignore[union-attr]
+    assert set(handler.collect("reloaded_package.child.Child", {}).inherited_members) == {"a"}
+    child_module = handler._modules_collection["reloaded_package.child"]
+
+    package.joinpath("base.py").write_text(
+        'class Base:\n    def a(self): ...\n    def b(self): ...\n\ndef f():\n    """New docstring."""\n',
+    )
+    package.joinpath("new.py").write_text("def g(): ...\n")
+    handler.teardown()
+    handler = get_handler(theme="material", paths=[str(tmp_path)], keep_loaded_modules=True)
+    assert handler.collect("reloaded_package.f", {}).docstring.value == "New docstring."  # type: ignore[union-attr]
+    assert set(handler.collect("reloaded_package.child.Child", {}).inherited_members) == {"a", "b"}
+    assert handler._modules_collection["reloaded_package.child"] is child_module
+    assert handler.collect("reloaded_package.new.g", {})
+
+    # Without `keep_loaded_modules`, loaded modules are not shared, and are released on teardown.
+    handler = get_handler(theme="material", paths=[str(tmp_path)])
+    assert "reloaded_package" not in handler._modules_collection
+    handler.collect("reloaded_package.f", {})
+    handler.teardown()
+    assert "reloaded_package" not in handler._modules_collection
+
+
+def test_parallel_loading(tmp_path: Path) -> None:
+    """Assert modules visited in worker processes are merged correctly.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    package = tmp_path / "parallel_package"
+    package.joinpath("sub").mkdir(parents=True)
+    package.joinpath("__init__.py").write_text("from parallel_package.sub.b import B\n\n__all__ = ['B']\n")
+    package.joinpath("a.py").write_text("from . import sub\n\ndef f():\n    '''Docstring.'''\n")
+    package.joinpath("sub", "__init__.py").write_text("")
+    package.joinpath("sub", "b.py").write_text("from ..a import f\n\nclass B:\n    '''Docstring.'''\n")
+    handler = get_handler(theme="material", paths=[str(tmp_path)], load_workers=2)
+    module = handler.collect("parallel_package", {})
+    assert module["a.f"].docstring.value == "Docstring."  # type: ignore[index]
+    assert module["a.f"].lines  # type: ignore[index]
+    assert module["sub.b"].parent is module["sub"]  # type: ignore[index]
+    assert module["sub.b.f"].target_path == "parallel_package.a.f"  # type: ignore[index]
+    assert module["B"].docstring.value == "Docstring."  # type: ignore[index]
+
+
+def test_evicting_packages(tmp_path: Path) -> None:
+    """Assert packages are unloaded when over the memory budget, and reloaded transparently.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    tmp_path.joinpath("base_package").mkdir()
+    tmp_path.joinpath("base_package", "__init__.py").write_text('class Base:\n    def a(self):\n        """A."""\n')
+    tmp_path.joinpath("child_package").mkdir()
+    tmp_path.joinpath("child_package", "__init__.py").write_text(
+        "from base_package import Base\n\nclass Child(Base): ...\n",
+    )
+    handler = get_handler(
+        theme="material",
+        paths=[str(tmp_path)],
+        cache_dir=str(tmp_path / "cache"),
+        modules_memory_budget=0,
+    )
+    collection = handler._modules_collection
+    base_file = tmp_path / "base_package" / "__init__.py"
+
+    assert handler.collect("base_package.Base", {})
+    assert collection.footprints["base_package"] > 0
+    assert base_file in handler._lines_collection
+
+    child = handler.collect("child_package.Child", {})
+    assert list(collection.footprints) == ["child_package"]
+    assert "base_package" not in collection.members
+    assert base_file not in handler._lines_collection
+
+    # Looking up an object in an evicted package reloads it, without evicting packages in use.
+    assert child.inherited_members["a"].docstring.value == "A."
+    assert list(collection.footprints) == ["child_package", "base_package"]
+    assert base_file in handler._lines_collection
+
+
+def test_rendered_fragments_cache(tmp_path: Path, plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert rendered fragments and their headings are reused across handler instances.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    handlers = []
+    for _ in range(2):
+        handler = get_handler(theme="material", cache_dir=str(tmp_path))
+        handler._update_env(ext_markdown, plugin.handlers._config)
+        handlers.append(handler)
+
+    data = handlers[0].collect("mkdocstrings_handlers.python.caching", {})
+    html = handlers[0].render(data, {"show_root_heading": True})
+    headings = [heading.get("id") for heading in handlers[0].get_headings()]
+    assert headings
+
+    handlers[1].env.get_template = None  # type: ignore[method-assign,assignment]
+    data = handlers[1].collect("mkdocstrings_handlers.python.caching", {})
+    assert handlers[1].render(data, {"show_root_heading": True}) == html
+    assert [heading.get("id") for heading in handlers[1].get_headings()] == headings
+
+
+def test_templates_bytecode_cache(tmp_path: Path, plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert compiled templates are persisted in the cache directory.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    handler = get_handler(theme="material", cache_dir=str(tmp_path))
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    handler.env.get_template("function.html.jinja")
+    assert list(tmp_path.joinpath("jinja").rglob("*.cache"))
+
+
+def test_deferred_formatting(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert signatures formatted in a batch are the same as signatures formatted one by one.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        """
+        def function(aaaaaaaaaa: int, bbbbbbbbbb: str = "bbbbbbbbbb", *args: int, **kwargs: str) -> None: ...
+        def other_function(cccccccccc: list[int], dddddddddd: dict[str, int] | None = None) -> None: ...
+        attribute: dict[str, int] = {"eeeeeeeeee": 1, "ffffffffff": 2, "gggggggggg": 3}
+        """,
+    )
+    config = {"separate_signature": True, "show_signature_annotations": True, "line_length": 40}
+    rendered = []
+    for format_workers in (None, 2):
+        handler = get_handler(theme="material", format_workers=format_workers)
+        handler._update_env(ext_markdown, plugin.handlers._config)
+        with temporary_visited_module(code) as module:
+            rendered.append(handler.render(module, dict(config)))
+        handler.teardown()
+    assert "mkdocstrings-python-deferred" not in rendered[1]
+    assert rendered[0] == rendered[1]
+
+
+def test_rendering_batches(tmp_path: Path, plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert objects rendered in parallel are the same as objects rendered one by one.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    package = tmp_path / "batch_package"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text(
+        dedent(
+            """
+            def f(a: int) -> int:
+                '''Summary.
+
+                Parameters:
+                    a: Parameter.
+
+                Returns:
+                    Value.
+                '''
+
+            class C:
+                '''Class.'''
+
+                def m(self, b: str) -> None:
+                    '''Method.
+
+                    Parameters:
+                        b: Parameter.
+                    '''
+            """,
+        ),
+    )
+    items = [
+        ("batch_package.f", {"show_root_heading": True}),
+        ("batch_package.C", {"show_root_heading": True, "separate_signature": True}),
+        ("batch_package.f", {"show_root_heading": True, "docstring_style": "numpy"}),
+        ("batch_package.C.m", {"heading_level": 3, "show_root_heading": True}),
+        ("batch_package.f", {"show_root_heading": True}),
+    ]
+    handler = get_handler(theme="material", paths=[str(tmp_path)])
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    sequential = [handler._render_item(identifier, dict(config)) for identifier, config in items]
+    parallel = handler.render_batch(items, workers=2)
+
+    assert [html for html, _ in parallel] == [html for html, _ in sequential]
+    for (_, parallel_headings), (_, sequential_headings) in zip(parallel, sequential):
+        assert [heading.attrib for heading in parallel_headings] == [heading.attrib for heading in sequential_headings]
+    assert parallel[0][0] == parallel[4][0] != parallel[2][0]
+    assert not handler.get_headings()
+
+    with pytest.raises(CollectionError):
+        handler.render_batch([*items, ("batch_package.missing", {})], workers=2)
+
+    # Code formatted in worker processes is kept in the handler's cache.
+    handler = get_handler(theme="material", paths=[str(tmp_path)])
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    config = {
+        "show_root_heading": True,
+        "separate_signature": True,
+        "show_signature_annotations": True,
+        "line_length": 10,
+    }
+    handler.render_batch([("batch_package.f", config), ("batch_package.C.m", config)], workers=2)
+    assert len(handler._formatted_code_cache.used()) == 2
+
+
+def test_rendering_crossrefs_concurrently(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert cross-references stashed in signatures do not leak from one render to another.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        """
+        class Aaaaaaaaaa: ...
+        class Bbbbbbbbbb: ...
+
+        def function(aaaaaaaaaa: Aaaaaaaaaa, bbbbbbbbbb: Bbbbbbbbbb | None = None) -> Aaaaaaaaaa:
+            '''Docstring.'''
+        """,
+    )
+    config = {
+        "show_root_heading": True,
+        "separate_signature": True,
+        "show_signature_annotations": True,
+        "signature_crossrefs": True,
+        "line_length": 40,
+    }
+    handler = get_handler(theme="material")
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    with temporary_visited_module(code) as module:
+        expected = handler.render(module["function"], config)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            rendered = list(executor.map(lambda _: handler.render(module["function"], config), range(16)))
+    assert 'identifier="module.Bbbbbbbbbb"' in expected
+    assert all(html == expected for html in rendered)
+
+
+def test_highlighting_signatures_natively(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert signatures highlighted natively are the same as signatures highlighted with Pygments.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        """
+        class Aaaaaaaaaa:
+            '''Class.'''
+
+            def method(self, aaaaaaaaaa: int, bbbbbbbbbb: str = "b", *args: Aaaaaaaaaa, **kwargs: str) -> None:
+                '''Method.'''
+
+        def function(aaaaaaaaaa: Aaaaaaaaaa | None = None, bbbbbbbbbb: list[int] = [1, 2]) -> Aaaaaaaaaa:
+            '''Function.'''
+
+        def unsupported(aaaaaaaaaa: str = "a\\nb") -> None:
+            '''Function.'''
+
+        attribute: dict[str, Aaaaaaaaaa] = {"eeeeeeeeee": 1, "ffffffffff": 2.5, "gggggggggg": None}
+        '''Attribute.'''
+        """,
+    )
+    config = {
+        "separate_signature": True,
+        "show_signature_annotations": True,
+        "signature_crossrefs": True,
+        "line_length": 40,
+    }
+    handler = get_handler(theme="material")
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    with temporary_visited_module(code) as module:
+        pygments_html = handler.render(module, config)
+        native_html = handler.render(module, {**config, "signature_highlighter": "native"})
+    assert native_html == pygments_html
+
+
+def test_formatting_with_ruff(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert signatures can be formatted with Ruff, in batches.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        """
+        def function(aaaaaaaaaa: int, bbbbbbbbbb: str = "bbbbbbbbbb") -> None:
+            '''Docstring.'''
+
+        attribute: dict[str, int] = {"eeeeeeeeee": 1, "ffffffffff": 2, "gggggggggg": 3}
+        '''Docstring.'''
+        """,
+    )
+    config = {"separate_signature": True, "line_length": 40, "signature_formatter": "ruff"}
+    handler = get_handler(theme="material")
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    with temporary_visited_module(code) as module:
+        html = handler.render(module, config)
+    assert "mkdocstrings-python-deferred" not in html
+    assert "ffffffffff" in html
+    assert "pass" not in html
+
+
+@pytest.mark.parametrize("section_style", ["table", "list", "spacy"])
+@pytest.mark.parametrize("parameter_headings", [True, False])
+def test_rendering_docstring_sections_natively(
+    plugin: MkdocstringsPlugin,
+    ext_markdown: Markdown,
+    section_style: str,
+    parameter_headings: bool,
+) -> None:
+    """Assert docstring sections rendered natively are the same as sections rendered with templates.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+        section_style: The docstring section style.
+        parameter_headings: Whether to render headings for parameters.
+    """
+    code = dedent(
+        '''
+        """Module.
+
+        Attributes:
+            attribute (int): An attribute.
+
+        Functions:
+            function: A function.
+
+        Classes:
+            Class: A class.
+
+        Modules:
+            submodule: A submodule.
+        """
+
+        class Class:
+            """Class.
+
+            Methods:
+                method: A method.
+            """
+
+            def __init__(self, value: int = 1) -> None:
+                """Initialize.
+
+                Parameters:
+                    value: A `value`.
+                """
+
+            def method(self) -> None:
+                """Method."""
+
+        def function(a: int, b: str = "b", *args: int, **kwargs: str) -> Class:
+            """Function.
+
+            Parameters:
+                a: The *first* parameter.
+                b: The second parameter.
+                *args: Variadic positional parameters.
+
+            Other Parameters:
+                c (int): Another parameter.
+
+            Returns:
+                A class instance.
+
+            Raises:
+                ValueError: When `a` is negative.
+
+            Warns:
+                UserWarning: Always.
+            """
+
+        def generator() -> Iterator[int]:
+            """Generator.
+
+            Yields:
+                value: Values.
+
+            Receives:
+                value (str): Values.
+            """
+        ''',
+    )
+    config = {
+        "docstring_section_style": section_style,
+        "parameter_headings": parameter_headings,
+        "show_symbol_type_toc": True,
+        "merge_init_into_class": True,
+        "summary": True,
+        "heading_level": 1,
+        "show_root_heading": True,
+    }
+    native_handler = get_handler(theme="material")
+    native_handler._update_env(ext_markdown, plugin.handlers._config)
+    jinja_handler = get_handler(theme="material")
+    jinja_handler._update_env(ext_markdown, plugin.handlers._config)
+    rendered_natively = []
+    render_native_section = native_handler.env.filters["render_native_section"]
+
+    @pass_context
+    def record_native_section(context: Context, section: DocstringSection, *args: Any) -> Markup:
+        rendered_natively.append(section.kind.value)
+        return render_native_section(context, section, *args)
+
+    native_handler.env.filters["render_native_section"] = record_native_section
+    jinja_handler.env.filters["render_native_section"] = record_native_section
+    with temporary_visited_module(code, docstring_parser=Parser.google) as module:
+        native_html = native_handler.render(module, {**config, "docstring_section_renderer": "native"})
+        # Every section kind is rendered natively when enabled, and never by default.
+        assert set(rendered_natively) == set(docstrings._renderers)
+        count = len(rendered_natively)
+        jinja_html = jinja_handler.render(module, config)
+        assert len(rendered_natively) == count
+    assert native_html == jinja_html
+    assert [heading.get("id") for heading in native_handler._headings] == [
+        heading.get("id") for heading in jinja_handler._headings
+    ]
+    assert "first" in native_html
+
+
+def test_markdown_conversions_cache(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert Markdown conversions are cached, and rendered HTML and headings are unchanged.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        '''
+        class Base:
+            """Base class."""
+
+            def method(self, value: int) -> None:
+                """Method.
+
+                # Heading
+
+                See [`Base`][].
+
+                Parameters:
+                    value: The value.
+                """
+
+        class A(Base):
+            """Subclass."""
+
+        class B(Base):
+            """Subclass."""
+        ''',
+    )
+    config = {"inherited_members": True, "show_root_heading": True}
+    results = []
+    with temporary_visited_module(code, docstring_parser="google") as module:
+        for size in (0, 4096):
+            handler = get_handler(theme="material", markdown_cache_size=size)
+            handler._update_env(ext_markdown, plugin.handlers._config)
+            html = [handler.render(module[name], config) for name in ("A", "B", "A")]
+            results.append((html, [heading.get("id") for heading in handler._headings], handler._markdown_cache))
+    (uncached_html, uncached_headings, uncached), (cached_html, cached_headings, cached) = results
+    assert cached_html == uncached_html
+    assert cached_headings == uncached_headings
+    assert not uncached.entries
+    # Only the descriptions containing ids or cross-references are converted again for each class.
+    assert cached.hits == 5
+    # Cross-references depend on the object being rendered.
+    assert 'origin="module.A.method"' in cached_html[0]
+    assert 'origin="module.B.method"' in cached_html[1]
+
+
+def test_highlighted_sources_cache(
+    tmp_path: Path,
+    plugin: MkdocstringsPlugin,
+    ext_markdown: Markdown,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Assert highlighted sources are reused across handler instances.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+        monkeypatch: Pytest fixture to patch objects.
+    """
+    config = {"show_source": True}
+    handler = get_handler(theme="material", cache_dir=str(tmp_path))
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    html = handler.render(handler.collect("mkdocstrings_handlers.python.caching", {}), config)
+    assert glob(str(tmp_path / "highlight" / "*" / "*.pickle"))
+
+    def highlight(*args: Any, inline: bool = False, linenums: bool | None = None, **kwargs: Any) -> Markup:
+        assert inline or not linenums, "source highlighted again"
+        return original_highlight(*args, inline=inline, linenums=linenums, **kwargs)
+
+    original_highlight = Highlighter.highlight
+    monkeypatch.setattr(Highlighter, "highlight", highlight)
+    handler = get_handler(theme="material", cache_dir=str(tmp_path))
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    handler._fragments_cache = None
+    assert handler.render(handler.collect("mkdocstrings_handlers.python.caching", {}), config) == html
+
+
+def test_lazy_sources(
+    tmp_path: Path,
+    mkdocs_conf: MkDocsConfig,
+    plugin: MkdocstringsPlugin,
+    ext_markdown: Markdown,
+) -> None:
+    """Assert lazy sources are written to separate files, also when rendered fragments are reused.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory (the site directory).
+        mkdocs_conf: Pytest fixture (see conftest.py).
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    page = File("api/caching.md", src_dir="docs", dest_dir=str(tmp_path), use_directory_urls=True)
+    ext_markdown.treeprocessors.register(_RelativePathTreeprocessor(page, Files([page]), mkdocs_conf), "relpath", 0)
+    sources_dir = tmp_path / "assets" / "_mkdocstrings_python" / "sources"
+    cache_dir = str(tmp_path / "cache")
+
+    handler = get_handler(theme="material", cache_dir=cache_dir)
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    data = handler.collect("mkdocstrings_handlers.python.caching", {})
+    inline_html = handler.render(data, {"show_source": True})
+    html = handler.render(data, {"show_source": "lazy"})
+    sources = sorted(sources_dir.iterdir())
+    assert sources
+    assert len(html) < len(inline_html)
+    assert 'class="linenos"' in inline_html
+    assert 'class="linenos"' not in html
+    assert f'data-src="../../assets/_mkdocstrings_python/sources/{sources[0].name}"' in html
+    assert sources[0].read_text(encoding="utf8") in inline_html
+
+    shutil.rmtree(sources_dir)
+    handler = get_handler(theme="material", cache_dir=cache_dir)
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    handler.env.get_template = None  # type: ignore[method-assign,assignment]
+    assert handler.render(data, {"show_source": "lazy"}) == html
+    assert sorted(sources_dir.iterdir()) == sources
+
+    # Without a site directory, sources of cached fragments are inlined.
+    handler = get_handler(theme="material", cache_dir=cache_dir)
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    handler._site_dir = None
+    assert handler.render(data, {"show_source": "lazy"}) == inline_html
+
+
+def test_splitting_members(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> None:
+    """Assert members of objects above the threshold are summarized instead of rendered.
+
+    Parameters:
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+    """
+    code = dedent(
+        '''
+        """Module."""
+
+        def f1():
+            """Function 1."""
+
+        def f2():
+            """Function 2."""
+
+        class Class:
+            """Class."""
+
+            def m1(self):
+                """Method 1."""
+
+            def m2(self):
+                """Method 2."""
+        ''',
+    )
+    handler = get_handler(theme="material")
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    with temporary_visited_module(code) as module:
+        html = handler.render(module, {"show_root_heading": True, "split_members_threshold": 2})
+    headings = [heading.get("id") for heading in handler.get_headings()]
+    # The module is split, not the class.
+    assert headings == ["module"]
+    assert '<autoref identifier="module.f1" optional hover>f1</autoref>' in html
+    assert '<autoref identifier="module.Class" optional hover>Class</autoref>' in html
+    assert "Method 1." not in html
+
+    handler = get_handler(theme="material")
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    with temporary_visited_module(code) as module:
+        handler.render(module, {"show_root_heading": True, "split_members_threshold": 3})
+    headings = [heading.get("id") for heading in handler.get_headings()]
+    assert headings == ["module", "module.Class", "module.Class.m1", "module.Class.m2", "module.f1", "module.f2"]
+
+
+def test_linking_to_summarized_members(
+    tmp_path: Path,
+    mkdocs_conf: MkDocsConfig,
+    plugin: MkdocstringsPlugin,
+    ext_markdown: Markdown,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Assert cross-references to summarized members resolve to their summaries, unless documented elsewhere.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+        mkdocs_conf: Pytest fixture (see conftest.py).
+        plugin: Pytest fixture (see conftest.py).
+        ext_markdown: Pytest fixture (see conftest.py).
+        caplog: Pytest fixture to capture logs.
+    """
+    package = tmp_path / "split_package"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text(
+        dedent(
+            '''
+            """Package."""
+
+            def f1():
+                """Function 1."""
+
+            def f2():
+                """Function 2."""
+
+            class Class:
+                """Class."""
+
+                def m1(self):
+                    """Method 1."""
+            ''',
+        ),
+    )
+    autorefs = mkdocs_conf["plugins"]["autorefs"]
+    pages = [
+        Page(name, File(f"{name}.md", "docs", str(tmp_path / "site"), use_directory_urls=True), mkdocs_conf)
+        for name in ("reference", "f1")
+    ]
+    autorefs.current_page = pages[0]
+    caplog.set_level(logging.INFO)
+    handler = get_handler(theme="material", paths=[str(tmp_path)])
+    handler._update_env(ext_markdown, plugin.handlers._config)
+    config = {"show_root_heading": True, "split_members_threshold": 2}
+    html = handler.render(handler.collect("split_package", config), config)
+    headings = handler.get_headings()
+
+    # Summarized members are anchored, but are not headings of the page.
+    assert [heading.get("id") for heading in headings] == ["split_package"]
+    assert '<a id="split_package.f1"></a>' in html
+    # Not a warning, since members are typically documented on other pages.
+    messages = [(record.levelname, record.getMessage()) for record in caplog.records]
+    assert any(level == "INFO" and "split_package: 3 members are only summarized" in msg for level, msg in messages)
+    assert autorefs.get_item_url("split_package.f1") == ("reference/#split_package.f1", None)
+    # Members of summarized members fall back to the summaries.
+    anchors = handler.get_anchors(handler.collect("split_package.Class.m1", handler.fallback_config))
+    assert anchors == ("split_package.Class.m1", "split_package.Class")
+    # Members documented elsewhere are linked to their documentation.
+    autorefs.register_anchor(pages[1], "split_package.f1")
+    assert autorefs.get_item_url("split_package.f1") == ("f1/#split_package.f1", None)
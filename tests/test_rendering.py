@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import pygments
 import pytest
 from griffe import ModulesCollection, temporary_visited_module
+from jinja2 import Environment, FileSystemLoader
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import PythonLexer
 
-from mkdocstrings_handlers.python import rendering
+from mkdocstrings_handlers.python import formatting, highlighting, rendering
+from mkdocstrings_handlers.python.caching import MemoryCache
 
 if TYPE_CHECKING:
     from markupsafe import Markup
@@ -46,6 +52,157 @@ def test_format_signature(name: Markup, signature: str) -> None:
         assert rendering._format_signature(name, signature, length)
 
 
+@pytest.mark.parametrize(
+    ("name", "signature"),
+    [
+        ("Class.method", "(param: str = 'hello') -> 'OtherClass'"),
+        ("function", '(aaaaaaaaaa: int, bbbbbbbbbb: str = "b(b", *args: int, **kwargs: str) -> None'),
+        ("function", "(self, x: dict[str, list[tuple[int, int, int]]] = {}, y: int = 1) -> dict[str, int]"),
+        ("function", "(path, *, follow_symlinks=True, missing_ok=False, parents=('a', 'b'))"),
+        ("function", "(path, /, *args, mode=0o777, exist_ok=False) -> None"),
+        ("function", "(envvars=('LC_ALL', 'LC_CTYPE', 'LANG', 'LANGUAGE'))"),
+        ("function", "(*args, key=None, default=f'{1}', **kwargs)"),
+        ("function", "(size=1_000_000, *, block=[*range(10)], values={**defaults}) -> Iterator[bytes]"),
+        ("function", "(mapping=None, /, **kwargs) -> Mapping[str, tuple[int, ...]]"),
+        ("function", "(obj_dict: dict[str, Any])"),
+        ("function", "(value: Literal['a', 'b'])"),
+        ("function", "(callback: Callable[[int, str], None])"),
+        ("function", "(value: tuple[int, int] = (1, 2))"),
+        ("function", "(*args: Callable[[int, str], None])"),
+        ("function", "(self, name: str) -> dict[str, Any] | list[tuple[int, int]] | None"),
+        ("function", "(x) -> Literal['aaaaaa', 'bbbbbb'] | None"),
+        ("function", "(x) -> 'dict[str, Any] | None'"),
+    ],
+)
+def test_format_signature_natively(name: str, signature: str) -> None:
+    """Assert signatures are wrapped natively like Black does.
+
+    Parameters:
+        name: Name of the function.
+        signature: Signature to format.
+    """
+    for length in range(20, 101):
+        black = rendering._format_signature(name, signature, length)  # type: ignore[arg-type]
+        assert rendering._format_signature(name, signature, length, "native") == black  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "CONSTANT: dict[str, list[int]] = {'aaaaaaaaaa': [1, 2, 3], 'bbbbbbbbbb': [4, 5, 6]}",
+        "FIELDS = collections.namedtuple('Fields', ['lineno', 'end_lineno', 'col_offset'], defaults=[None] * 3)",
+        "MAPPING = {s.encode(): n + 1 for n, s in enumerate(MONTHS[1:])}",
+        "NAMES = [name.lower() for name in dir(module) if not name.startswith('_') if name]",
+        "DEFAULT_ENCODING = 'utf-8-sig-with-a-very-long-name-that-does-not-fit'",
+        'HEADER = b\'<?xml version="1.0" encoding="UTF-8"?><!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN">\'',
+        "TIMEOUT = socket.getdefaulttimeout",
+        "PATTERN = re.compile('^(?P<name>[a-z0-9_]+)=(?P<value>.*)$', re.VERBOSE).match",
+    ],
+)
+def test_format_attribute_natively(code: str) -> None:
+    """Assert attribute values are wrapped natively like Black does.
+
+    Parameters:
+        code: Code to format.
+    """
+    for length in range(40, 101):
+        assert rendering.do_format_code(code, length, "native") == rendering.do_format_code(code, length).rstrip("\n")
+
+
+def test_stashing_crossrefs() -> None:
+    """Assert cross-references are stashed per signature, with deterministic keys of the right length."""
+    crossrefs = [f"<autoref identifier='module.Class{index}'>Class{index}</autoref>" for index in range(100)]
+    assert rendering.do_stash_crossref(crossrefs[0], length=6) == crossrefs[0]
+    for _ in range(2):
+        with rendering._stashing_crossrefs() as stash:
+            keys = [rendering.do_stash_crossref(crossref, length=6) for crossref in crossrefs]
+            with rendering._stashing_crossrefs() as other_stash:
+                assert rendering.do_stash_crossref(crossrefs[1], length=6) == keys[0]
+        assert keys[:2] == ["_____0", "_____1"]
+        assert len(set(keys)) == len(keys)
+        assert all(len(key) == 6 and key.isidentifier() for key in keys)
+        assert other_stash.crossrefs == {keys[0]: crossrefs[1]}
+        code = f"f(_private: {keys[10]} = {keys[99]}) -> {keys[10]}"
+        assert stash.unstash(code) == f"f(_private: {crossrefs[10]} = {crossrefs[99]}) -> {crossrefs[10]}"
+
+
+def test_stashing_short_crossrefs() -> None:
+    """Assert keys are never longer than short cross-references, which are not stashed once keys run out."""
+    crossrefs = [f"<autoref identifier='module.T{index}'>T</autoref>" for index in range(100)]
+    with rendering._stashing_crossrefs() as stash:
+        keys = [rendering.do_stash_crossref(crossref, length=1) for crossref in crossrefs]
+        assert rendering.do_stash_crossref(crossrefs[0], length=1) == keys[0]
+    assert keys[:2] == ["_0", "_1"]
+    assert len(set(keys[:62])) == 62
+    assert keys[62:] == ["T"] * 38
+    assert stash.unstash(" | ".join(keys)) == " | ".join([*crossrefs[:62], *keys[62:]])
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        'Class.method(\n    param: str = "hello",\n    *args: int,\n    **kwargs: dict[str, int] | None = None,\n) -> "OtherClass"',
+        "f(self, a=1.5, b=-1, c=True, d=..., e=b'x', g=lambda: 1, /, *, h: list[int] = [0x1F, 1_000, 1e-5j]) -> None",
+        "X: int = 1 + 2 * 3 // 4 ** 5 and not x or y is z in w if obj.__class__ else ValueError",
+        "sorted(iterable, key=None, reverse=False, default=Ellipsis, other=x.int)",
+    ],
+)
+def test_highlighting_natively(code: str) -> None:
+    """Assert code is highlighted natively like Pygments does.
+
+    Parameters:
+        code: Code to highlight.
+    """
+    expected = pygments.highlight(code, PythonLexer(), HtmlFormatter(nowrap=True))
+    assert highlighting.highlight(code) + "\n" == expected  # type: ignore[operator]
+
+
+@pytest.mark.parametrize("code", ["f(x='a\\nb')", "f(x=f'{a}')", "f(x='%s')", "match(x)", "@decorator"])
+def test_not_highlighting_unsupported_code(code: str) -> None:
+    """Assert code with unsupported syntax is not highlighted natively.
+
+    Parameters:
+        code: Code to highlight.
+    """
+    assert highlighting.highlight(code) is None
+
+
+def test_formatting_code_in_batches() -> None:
+    """Assert code formatted in a batch is the same as code formatted snippet by snippet."""
+    codes = [
+        ("def xxxx(aaaaaaaaaa: int, bbbbbbbbbb: str = 'b') -> None: pass", 30),
+        ("CONSTANT = {'aaaaaaaaaa': 1, 'bbbbbbbbbb': 2}", 20),
+        ("def xxxx(invalid syntax): pass", 20),
+    ]
+    for name in ("black", "ruff"):
+        backend = formatting.get_formatter(name)
+        formatted = backend.format_many(codes)
+        assert formatted == [backend.format(code, line_length) for code, line_length in codes]
+        assert formatted[2] == codes[2][0]
+
+
+def test_falling_back_to_other_formatter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Assert unavailable formatters fall back to other ones, or leave code unformatted.
+
+    Parameters:
+        monkeypatch: Pytest fixture to temporarily patch objects.
+    """
+
+    class UnavailableFormatter(formatting.Formatter):
+        name = "unavailable"
+        fallback = "black"
+
+    monkeypatch.setitem(formatting.formatters, "unavailable", UnavailableFormatter)
+    formatting.get_formatter.cache_clear()
+    try:
+        assert isinstance(formatting.get_formatter("unavailable"), formatting.BlackFormatter)
+        monkeypatch.setattr(UnavailableFormatter, "fallback", None)
+        formatting.get_formatter.cache_clear()
+        assert formatting.get_formatter("unavailable").format("x  =  1", 10) == "x  =  1"
+    finally:
+        formatting.get_formatter.cache_clear()
+
+
 @dataclass
 class _FakeObject:
     name: str
@@ -56,6 +213,12 @@ class _FakeObject:
     ("names", "filter_params", "expected_names"),
     [
         (["aa", "ab", "ac", "da"], {"filters": [(re.compile("^a[^b]"), True)]}, {"ab", "da"}),
+        (["aa", "ab", "ac", "da"], {"filters": [(re.compile("^a"), False)]}, {"aa", "ab", "ac"}),
+        (
+            ["aa", "ab", "ac", "da"],
+            {"filters": [(re.compile("^a"), True), (re.compile("^ab"), False)]},
+            {"ab", "da"},
+        ),
         (["aa", "ab", "ac", "da"], {"members_list": ["aa", "ab"]}, {"aa", "ab"}),
     ],
 )
@@ -164,3 +327,135 @@ def test_ordering_members(order: rendering.Order, members_list: list[str | None]
     members = [Obj("a", 10, is_alias=True), Obj("b", 9, is_alias=False), Obj("c", 8, is_alias=True)]
     ordered = rendering.do_order_members(members, order, members_list)  # type: ignore[arg-type]
     assert [obj.name for obj in ordered] == expected_names
+
+
+@pytest.mark.parametrize("annotations_path", ["brief", "source", "full"])
+@pytest.mark.parametrize("signature", [True, False])
+@pytest.mark.parametrize("crossrefs", [True, False])
+@pytest.mark.parametrize("unwrap_annotated", [True, False])
+def test_rendering_expressions_natively(
+    annotations_path: str,
+    signature: bool,
+    crossrefs: bool,
+    unwrap_annotated: bool,
+) -> None:
+    """Assert expressions rendered natively are the same as expressions rendered with the template.
+
+    Parameters:
+        annotations_path: The `annotations_path` option.
+        signature: Whether expressions are rendered in a signature.
+        crossrefs: The `signature_crossrefs` option.
+        unwrap_annotated: The `unwrap_annotated` option.
+    """
+    code = """
+        import enum
+        from typing import Annotated, Optional
+        from collections import abc
+
+        class Kind(enum.Enum):
+            A = 1
+
+        def f(a: Optional[abc.Iterator[str]], b: Annotated[int, "<b>"] = Kind.A.value, c: dict = dict(x="<'>")): ...
+    """
+    env = Environment(
+        loader=FileSystemLoader(Path(rendering.__file__).parent / "templates" / "material"),
+        autoescape=True,
+    )
+    env.filters["split_path"] = rendering.do_split_path
+    env.filters["stash_crossref"] = rendering.do_stash_crossref
+    env.filters["render_expression"] = rendering.do_render_expression
+    config = {
+        "annotations_path": annotations_path,
+        "signature_crossrefs": crossrefs,
+        "unwrap_annotated": unwrap_annotated,
+    }
+    native = env.from_string("{{ expression|render_expression }}")
+    with temporary_visited_module(code) as module:
+        parameters = list(module["f"].parameters)
+        expressions = [param.annotation for param in parameters] + [param.default for param in parameters[1:]]
+        for expression in expressions:
+            for _ in range(2):
+                with rendering._stashing_crossrefs() as stash:
+                    html = native.render(config=config, expression=expression, signature=signature)
+                    expected = env.get_template("expression.html.jinja").render(
+                        config=config,
+                        expression=expression,
+                        signature=signature,
+                    )
+                assert stash.unstash(html) == stash.unstash(expected)
+
+
+def test_rendering_overridden_expression_template(tmp_path: Path) -> None:
+    """Assert expressions are rendered with the expression template when it is overridden.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), autoescape=True)
+    env.filters["render_expression"] = rendering.do_render_expression
+    tmp_path.joinpath("expression.html.jinja").write_text("<i>{{ expression }}</i>")
+    assert env.from_string("{{ expression|render_expression }}").render(expression="a") == "<i>a</i>"
+
+
+def test_resolving_templates_once(tmp_path: Path) -> None:
+    """Assert template names are resolved once per environment, until the loader changes.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), autoescape=True)
+    assert rendering.do_get_template(env, "function") == "function.html.jinja"
+
+    tmp_path.joinpath("function.html").write_text("")
+    assert rendering.do_get_template(env, "function") == "function.html.jinja"
+
+    env.loader = FileSystemLoader(str(tmp_path))
+    assert rendering.do_get_template(env, "function") == "function.html"
+
+
+def test_indexing_existing_templates(tmp_path: Path) -> None:
+    """Assert existing templates are listed once per environment, until the loader changes.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), autoescape=True)
+    tmp_path.joinpath("a.html.jinja").write_text("")
+    assert rendering.do_existing_template(env, "a.html.jinja")
+    assert not rendering.do_existing_template(env, "b.html.jinja")
+
+    tmp_path.joinpath("b.html.jinja").write_text("")
+    assert not rendering.do_existing_template(env, "b.html.jinja")
+
+    env.loader = FileSystemLoader(str(tmp_path))
+    assert rendering.do_existing_template(env, "b.html.jinja")
+
+
+def test_caching_formatted_code(tmp_path: Path) -> None:
+    """Assert formatted code is cached, and can be persisted.
+
+    Parameters:
+        tmp_path: Pytest fixture that creates a temporary directory.
+    """
+    cache = MemoryCache()
+    cache.load(tmp_path / "formatted-code.pickle")
+    code = "aaaaa(bbbbb, ccccc=1) + ddddd.eeeee[ffff] or {ggggg: hhhhh, iiiii: jjjjj}"
+    other_code = "kkkkk(lllll, mmmmm=1) + nnnnn.ooooo[pppp] or {qqqqq: rrrrr, sssss: ttttt}"
+    with rendering.caching_formatted_code(cache):
+        formatted = rendering.do_format_code(code, 20)
+        rendering.do_format_code(other_code, 20)
+        assert rendering.do_format_code(code, 20) == formatted
+    assert cache.hits == 1
+    cache.save()
+
+    # Only the entries used since they were loaded are saved again.
+    new_cache = MemoryCache()
+    new_cache.load(tmp_path / "formatted-code.pickle")
+    assert len(new_cache.entries) == 2
+    with rendering.caching_formatted_code(new_cache):
+        assert rendering.do_format_code(code, 20) == formatted
+    new_cache.save()
+    assert list(new_cache.entries.values()) == [formatted]
+    new_cache = MemoryCache()
+    new_cache.load(tmp_path / "formatted-code.pickle")
+    assert list(new_cache.entries.values()) == [formatted]